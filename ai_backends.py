@@ -0,0 +1,126 @@
+import os
+import json
+import threading
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+# A backend turns (api_key, base_url) into a client with the OpenAI-style surface the review generator uses:
+#   client.chat.completions.create(model=..., messages=..., temperature=..., max_tokens=..., stream=..., response_format=...)
+#   client.models.list()
+# Responses are read as response.choices[0].message.content / .usage.total_tokens, stream chunks as
+# chunk.choices[0].delta.content. Errors should carry .status_code and .response.headers so the
+# request scheduler can tell what to retry and how long to wait.
+
+
+class AIBackendError(Exception):
+    def __init__(self, message, status_code=None, response=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+def _groq_backend(api_key, base_url=None):
+    # groq pulls in httpx, pydantic and friends, so it's only imported once a client is really needed.
+    # Without base_url the SDK falls back to GROQ_BASE_URL and then to Groq's API.
+    from groq import Groq
+    # Retries are handled by the request scheduler, which also knows about our rate limits
+    return Groq(api_key=api_key, base_url=base_url, max_retries=0)
+
+
+class _Fields(SimpleNamespace):
+    # Like the SDKs' response models: an optional field the server left out reads as None
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+def _to_namespace(data):
+    return json.loads(data, object_hook=lambda fields: _Fields(**fields))
+
+
+class OpenAICompatibleClient:
+    # Talks to any OpenAI-compatible /chat/completions endpoint (llama.cpp, vLLM, Ollama, ai_stub_server.py, ...)
+    # with nothing but the standard library. Every thread keeps its own keep-alive connection.
+    def __init__(self, api_key, base_url=None, timeout=120.0):
+        base_url = base_url or os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.local = threading.local()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create_chat_completion))
+        self.models = SimpleNamespace(list=self.list_models)
+
+    def _connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            import http.client
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = self.local.connection = cls(self.host, self.port, timeout=self.timeout)
+        return connection
+
+    def _request(self, method, path, body=None):
+        headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "application/json"}
+        if body is not None:
+            body = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        connection = self._connection()
+        try:
+            connection.request(method, self.path + path, body, headers)
+            response = connection.getresponse()
+        except (OSError, ConnectionError):
+            # The server may have closed the kept-alive connection, start over with a fresh one next time
+            connection.close()
+            self.local.connection = None
+            raise
+        if response.status >= 400:
+            data = response.read()
+            try:
+                message = json.loads(data)["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                message = data.decode("utf-8", "replace")[:200]
+            raise AIBackendError(f"Error code: {response.status} - {message}", response.status,
+                                 SimpleNamespace(status_code=response.status, headers=response.headers))
+        return response
+
+    def list_models(self):
+        return _to_namespace(self._request("GET", "/models").read())
+
+    def create_chat_completion(self, model, messages, stream=False, **params):
+        body = dict(params, model=model, messages=messages, stream=stream)
+        response = self._request("POST", "/chat/completions", body)
+        if not stream:
+            return _to_namespace(response.read())
+        return self._read_events(response)
+
+    def _read_events(self, response):
+        # Server-sent events, one "data: {chunk}" line per chunk, ending with "data: [DONE]"
+        with response:
+            for line in response:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                yield _to_namespace(data)
+            response.read()  # drain the rest so the connection can be reused
+
+
+AI_BACKENDS = {
+    "groq": _groq_backend,
+    "openai": OpenAICompatibleClient,
+}
+
+def register_ai_backend(name, factory):
+    # factory(api_key, base_url) -> client with the surface described at the top of this file
+    AI_BACKENDS[name] = factory
+
+def create_ai_client(backend, api_key, base_url=None):
+    factory = AI_BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"Unknown AI backend '{backend}', choose from: {', '.join(AI_BACKENDS)}")
+    return factory(api_key, base_url)
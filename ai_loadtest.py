@@ -0,0 +1,125 @@
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+import review_generator_ai as ai
+from ai_scheduler import RequestScheduler
+from ai_stub_server import StubConfig, start_stub_server, stub_base_url
+
+# Drives many review enhancements at once through the real AI path (options, scheduler, retries, client)
+# against ai_stub_server.py, or any server given with --base-url, and reports latency percentiles and throughput.
+
+SAMPLE_SECTIONS = {
+    "main": "A short open world game about a lighthouse keeper.\nIt takes about ten hours to finish.",
+    "gameplay": "You repair the lamp, trade with passing ships and explore the island at low tide.",
+    "combat": "There is very little combat, mostly chasing crabs away from the generator.",
+    "art": "Hand painted scenery with a lovely day and night cycle.",
+    "story": "Letters from the previous keeper slowly explain why the island was abandoned.",
+    "tldr": "Calm, pretty and a little too short.",
+}
+
+
+def sample_review(index):
+    # Every review is a little different, so nothing is accidentally served from a cache along the way
+    return {key: f"{text} (review {index})" for key, text in SAMPLE_SECTIONS.items()}
+
+def percentiles(samples):
+    if not samples:
+        return None
+    if len(samples) == 1:
+        return samples[0], samples[0], samples[0]
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+def run_load_test(reviews, concurrency, options, api_key="stub"):
+    ai.ai_call_metrics.clear()
+
+    def enhance(index):
+        started = time.perf_counter()
+        results = ai.enhance_sections(sample_review(index), api_key, options)
+        return time.perf_counter() - started, sum(1 for value in results.values() if value is None)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(enhance, range(reviews)))
+    wall = time.perf_counter() - started
+
+    calls = list(ai.ai_call_metrics)
+    return {
+        "reviews": reviews,
+        "wall": wall,
+        "review_latency": percentiles([latency for latency, _ in outcomes]),
+        "request_latency": percentiles([call["latency"] for call in calls]),
+        "ttft": percentiles([call["ttft"] for call in calls]) if options.stream else None,
+        "requests": len(calls),
+        "failed_sections": sum(failed for _, failed in outcomes),
+        "scheduler": dict(ai.get_ai_scheduler(options).stats),
+    }
+
+def report(result):
+    def line(label, values):
+        if values:
+            p50, p95, p99 = values
+            print(f"  {label:<18} p50 {p50 * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms   p99 {p99 * 1000:8.1f} ms")
+
+    wall = result["wall"]
+    stats = result["scheduler"]
+    print(f"\n{result['reviews']} reviews in {wall:.2f}s: {result['reviews'] / wall:.1f} reviews/s, "
+          f"{result['requests'] / wall:.1f} AI requests/s")
+    line("review latency", result["review_latency"])
+    line("request latency", result["request_latency"])
+    line("time to 1st token", result["ttft"])
+    print(f"  {stats['requests']} attempts, {stats['retries']} retries, {stats['tokens']} tokens, "
+          f"{stats['waited']:.1f}s waiting on rate limits, {result['failed_sections']} sections failed")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Load-test the AI path with many concurrent review enhancements.")
+    parser.add_argument("-n", "--reviews", type=int, default=200, help="reviews to enhance (default: 200)")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="reviews in flight at once (default: 20)")
+    parser.add_argument("--section-concurrency", type=int, default=len(SAMPLE_SECTIONS),
+                        help="AI calls in flight per review (default: one per section)")
+    parser.add_argument("--stream", action="store_true", help="stream completions and report time to first token")
+    parser.add_argument("--bundle", action="store_true", help="one JSON request per review instead of one per section")
+    parser.add_argument("--backend", choices=sorted(ai.AI_BACKENDS), default="openai")
+    parser.add_argument("--base-url", help="test this server instead of starting the bundled stub")
+    parser.add_argument("--model", default="stub")
+    parser.add_argument("--rpm", type=int, default=0, help="client-side requests per minute, 0 for no limit (default)")
+    parser.add_argument("--tpm", type=int, default=0, help="client-side tokens per minute, 0 for no limit (default)")
+    parser.add_argument("--max-retries", type=int, default=ai.AI_MAX_RETRIES)
+    stub = parser.add_argument_group("bundled stub (ignored with --base-url)")
+    stub.add_argument("--latency", type=float, default=0.2, help="seconds per request (default: 0.2)")
+    stub.add_argument("--jitter", type=float, default=0.05, help="random +- seconds (default: 0.05)")
+    stub.add_argument("--token-interval", type=float, default=0.0, help="seconds between streamed tokens")
+    stub.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500")
+    stub.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    stub.add_argument("--retry-after", type=float, default=0.5, help="Retry-After seconds sent with a 429")
+    stub.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = start_stub_server(StubConfig(args.latency, args.jitter, args.token_interval, args.error_rate,
+                                              args.rate_limit_rate, args.retry_after, None, args.seed))
+        base_url = stub_base_url(server)
+    print(f"Enhancing {args.reviews} reviews, {args.concurrency} at a time, against {base_url} ...")
+
+    # The cache is off, every section must really reach the backend
+    scheduler = RequestScheduler(args.rpm, args.tpm, args.max_retries, base_delay=0.1, max_delay=5.0)
+    options = ai.AIOptions(concurrency=args.section_concurrency, cache="off", stream=args.stream, bundle=args.bundle,
+                           scheduler=scheduler, backend=args.backend, base_url=base_url, model=args.model)
+    try:
+        report(run_load_test(args.reviews, args.concurrency, options))
+        if server:
+            print(f"  stub: {server.stats}")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
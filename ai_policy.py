@@ -0,0 +1,150 @@
+import re
+import json
+import time
+import threading
+from collections import namedtuple
+
+# Decides, without asking anybody, which sections get enhanced and whether the AI's version replaces the
+# original. A policy file is JSON, every key optional:
+#   {
+#     "defaults": {"enhance": true, "accept": "auto", "min_ratio": 1.0, "max_ratio": 4.0, "reject_refusals": true,
+#                  "reject_intros": true},
+#     "sections": {"tldr": {"enhance": false}, "story": {"max_ratio": 2.5}}
+#   }
+# enhance          - send the section to the AI at all
+# accept           - "auto": keep the AI version when it passes the rules below, "always": keep it whenever there
+#                    is one, "never": only record what the AI would have written
+# min/max_ratio    - bounds for len(enhanced) / len(original), null for no bound
+# reject_refusals  - reject answers that look like the model declining ("I'm sorry, but I can't ...")
+# reject_intros    - reject answers opening with the introductory phrases the prompts forbid ("Here is ...", "Sure!")
+# A section's settings are layered: built-in (SECTION_DEFAULTS, e.g. the TL;DR may be shorter), then the file's
+# "defaults", then its own entry under "sections", then the command line. Later layers win.
+
+SectionPolicy = namedtuple("SectionPolicy", ["enhance", "accept", "min_ratio", "max_ratio", "reject_refusals",
+                                             "reject_intros"],
+                           defaults=[True, "auto", 1.0, 4.0, True, True])
+ACCEPT_MODES = ("auto", "always", "never")
+
+# Built-in settings per section, anything the user sets goes on top; the TL;DR is a summary, so it may be shorter
+SECTION_DEFAULTS = {"tldr": {"min_ratio": 0.2, "max_ratio": 3.0}}
+
+REFUSAL_PATTERNS = re.compile(
+    r"^\s*(i'?m sorry|i am sorry|sorry, but|i apologi[sz]e|as an ai\b|i can(?:'|no)t (?:help|assist|provide|write|create|fulfil)"
+    r"|i(?: am|'m) (?:unable|not able) to|i won'?t be able to|i must decline)",
+    re.IGNORECASE)
+
+INTRO_PATTERNS = re.compile(
+    r"^\s*(here(?:'s| is| are)\b|sure[,!.]|certainly[,!.]|of course[,!.]|absolutely[,!.]|let'?s (?:dive|take a look)"
+    r"|in this (?:section|review)\b|below is\b|the (?:enhanced|expanded|improved|revised) (?:version|text|section))",
+    re.IGNORECASE)
+
+
+class PolicyError(ValueError):
+    pass
+
+
+class EnhancementPolicy:
+    def __init__(self, defaults=None, sections=None, only=None):
+        self.defaults = defaults or SectionPolicy()
+        self.sections = sections or {}
+        self.only = only  # e.g. from --sections, limits enhancing to these sections whatever the policy says
+
+    def for_section(self, name):
+        return self.sections.get(name, self.defaults)
+
+    def allows(self, name):
+        return self.only is None or name in self.only
+
+
+def default_section_policy(name):
+    return SectionPolicy()._replace(**SECTION_DEFAULTS.get(name, {}))
+
+def _check_fields(fields, where):
+    if not isinstance(fields, dict):
+        raise PolicyError(f"{where} must be an object")
+    unknown = set(fields) - set(SectionPolicy._fields)
+    if unknown:
+        raise PolicyError(f"{where}: unknown setting(s) {', '.join(sorted(unknown))}")
+    for name, value in fields.items():
+        if name == "accept":
+            if value not in ACCEPT_MODES:
+                raise PolicyError(f"{where}: accept must be one of {', '.join(ACCEPT_MODES)}")
+        elif name in ("min_ratio", "max_ratio"):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+                raise PolicyError(f"{where}: {name} must be a non-negative number or null, not {json.dumps(value)}")
+        elif not isinstance(value, bool):
+            raise PolicyError(f"{where}: {name} must be true or false, not {json.dumps(value)}")
+    return fields
+
+def load_policy(path=None, only=None, **overrides):
+    # overrides (from the command line) replace the file's settings for every section, None values are ignored
+    data = {}
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise PolicyError(f"could not read policy {path}: {e}")
+    if not isinstance(data, dict):
+        raise PolicyError(f"policy {path} must be a JSON object")
+    if not isinstance(data.get("sections", {}), dict):
+        raise PolicyError(f"policy {path}: sections must be an object")
+    default_fields = _check_fields(data.get("defaults", {}), "defaults")
+    overrides = {name: value for name, value in overrides.items() if value is not None}
+    defaults = SectionPolicy()._replace(**default_fields)._replace(**overrides)
+    section_fields = {name: {} for name in SECTION_DEFAULTS}
+    for name, fields in data.get("sections", {}).items():
+        section_fields[name.lower()] = _check_fields(fields, f"sections.{name}")
+    sections = {name: default_section_policy(name)._replace(**default_fields)._replace(**fields)._replace(**overrides)
+                for name, fields in section_fields.items()}
+    return EnhancementPolicy(defaults, sections, only and {name.strip().lower() for name in only})
+
+
+def looks_like_refusal(text):
+    return bool(REFUSAL_PATTERNS.match(text))
+
+def starts_with_intro(text):
+    return bool(INTRO_PATTERNS.match(text))
+
+def length_ratio(original, enhanced):
+    return len(enhanced) / max(1, len(original))
+
+def check_enhancement(original, enhanced, policy):
+    # Returns (accepted, reason)
+    if not enhanced:
+        return False, "no answer"
+    if policy.accept == "never":
+        return False, "policy keeps the original"
+    if policy.accept == "always":
+        return True, "policy accepts every answer"
+    if policy.reject_refusals and looks_like_refusal(enhanced):
+        return False, "looks like a refusal"
+    if policy.reject_intros and starts_with_intro(enhanced):
+        return False, "starts with an introductory phrase"
+    ratio = length_ratio(original, enhanced)
+    if policy.min_ratio is not None and ratio < policy.min_ratio:
+        return False, f"too short ({ratio:.2f}x the original, minimum {policy.min_ratio}x)"
+    if policy.max_ratio is not None and ratio > policy.max_ratio:
+        return False, f"too long ({ratio:.2f}x the original, maximum {policy.max_ratio}x)"
+    return True, "passed the checks"
+
+
+class AuditLog:
+    # One JSON object per line for every decision, appended as it is made so an interrupted run keeps its log
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def record(self, review, section, decision, reason, original=None, enhanced=None, **extra):
+        if not self.path:
+            return
+        entry = {"time": time.time(), "review": review, "section": section, "decision": decision, "reason": reason}
+        if original is not None:
+            entry["original_chars"] = len(original)
+        if enhanced:
+            entry["enhanced_chars"] = len(enhanced)
+            entry["ratio"] = round(length_ratio(original or "", enhanced), 3)
+        entry.update(extra)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
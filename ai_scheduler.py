@@ -0,0 +1,174 @@
+import time
+import random
+import threading
+from tracing import span
+
+# Statuses worth another try: rate limited, timed out or a temporary server problem
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class BudgetExceededError(Exception):
+    pass
+
+
+class TokenBucket:
+    # Holds up to `capacity` units and refills `capacity` units every `period` seconds
+    def __init__(self, capacity, period=60.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        # Takes `amount` right away, the balance may go negative so callers queue up in order.
+        # Returns how many seconds to wait before the reserved amount is really available.
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, amount):
+        # Positive takes more, negative gives back (e.g. when a request used fewer tokens than reserved)
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+def status_code(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+def is_retryable(error):
+    status = status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # No HTTP status at all: dropped connections and timeouts (the SDKs use their own exception types for these)
+    name = type(error).__name__
+    return isinstance(error, (ConnectionError, TimeoutError)) or "Connection" in name or "Timeout" in name
+
+def retry_after_seconds(error):
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        # Retry-After may also be an HTTP date
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    # Sits under every AI call: waits for request/token rate limits, retries transient failures with
+    # exponential backoff and jitter (or the server's Retry-After), and stops once the run's budget is spent.
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_retries=5, base_delay=1.0,
+                 max_delay=60.0, token_budget=None, cost_budget=None, price_per_million_tokens=0.0,
+                 sleep=time.sleep, clock=time.monotonic):
+        self.requests = TokenBucket(requests_per_minute, 60.0, clock) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, 60.0, clock) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.token_budget = token_budget
+        self.cost_budget = cost_budget
+        self.price_per_million_tokens = price_per_million_tokens
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.reserved_tokens = 0
+        self.stats = {"requests": 0, "retries": 0, "tokens": 0, "waited": 0.0}
+
+    def cost(self, tokens):
+        return tokens * self.price_per_million_tokens / 1_000_000
+
+    def backoff_delay(self, attempt):
+        # Exponential backoff with "equal jitter": half fixed, half random, so parallel callers spread out
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def _reserve_budget(self, estimated_tokens):
+        with self.lock:
+            projected = self.stats["tokens"] + self.reserved_tokens + estimated_tokens
+            if self.token_budget is not None and projected > self.token_budget:
+                raise BudgetExceededError(f"token budget of {self.token_budget} for this run is used up")
+            if self.cost_budget is not None and self.cost(projected) > self.cost_budget:
+                raise BudgetExceededError(f"cost budget of ${self.cost_budget:.4f} for this run is used up")
+            self.reserved_tokens += estimated_tokens
+
+    def _wait(self, seconds):
+        if seconds > 0:
+            with self.lock:
+                self.stats["waited"] += seconds
+            with span("rate limit wait", seconds=round(seconds, 3)):
+                self.sleep(seconds)
+
+    def _wait_for_capacity(self, estimated_tokens):
+        wait = 0.0
+        if self.requests:
+            wait = self.requests.reserve(1)
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        self._wait(wait)
+
+    def run(self, send, estimated_tokens):
+        # send() makes one attempt and returns (result, tokens actually used or None if unknown)
+        self._reserve_budget(estimated_tokens)
+        try:
+            attempt = 0
+            while True:
+                self._wait_for_capacity(estimated_tokens)
+                with self.lock:
+                    self.stats["requests"] += 1
+                try:
+                    result, used_tokens = send()
+                except Exception as error:
+                    if attempt >= self.max_retries or not is_retryable(error):
+                        raise
+                    delay = retry_after_seconds(error)
+                    if delay is None:
+                        delay = self.backoff_delay(attempt)
+                    # A bogus Retry-After (a day, a date years away) must not park the worker
+                    delay = min(delay, self.max_delay)
+                    attempt += 1
+                    with self.lock:
+                        self.stats["retries"] += 1
+                    self._wait(delay)
+                    continue
+
+                if used_tokens is None:
+                    used_tokens = estimated_tokens
+                if self.tokens:
+                    self.tokens.adjust(used_tokens - estimated_tokens)
+                with self.lock:
+                    self.stats["tokens"] += used_tokens
+                return result
+        finally:
+            with self.lock:
+                self.reserved_tokens -= estimated_tokens
+
+    def report(self):
+        stats = self.stats
+        cost = f" (~${self.cost(stats['tokens']):.4f})" if self.price_per_million_tokens else ""
+        print(f"AI requests: {stats['requests']} ({stats['retries']} retries), {stats['tokens']} tokens{cost}, "
+              f"{stats['waited']:.1f}s spent waiting on rate limits.")
@@ -0,0 +1,222 @@
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A local stand-in for Groq / any OpenAI-compatible API, for testing and load-testing the AI path offline.
+# Point the generator at it with:
+#   --backend openai --base-url http://127.0.0.1:8000/v1     (standard library client)
+#   GROQ_BASE_URL=http://127.0.0.1:8000                      (Groq SDK, it calls /openai/v1/...)
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 8000
+
+# latency / jitter: seconds before the first byte, uniformly +- jitter
+# token_interval: seconds between streamed tokens
+# error_rate / rate_limit_rate: share of requests answered with a 500 / a 429 carrying Retry-After: retry_after
+# responses: canned answers, a list (used in turn) or {"text in the prompt": answer}, None echoes the prompt
+StubConfig = namedtuple("StubConfig", ["latency", "jitter", "token_interval", "error_rate", "rate_limit_rate",
+                                       "retry_after", "responses", "seed"],
+                        defaults=[0.2, 0.0, 0.0, 0.0, 0.0, 1.0, None, None])
+
+BUNDLED_SECTION = re.compile(r'^Section "([^"]+)":$', re.MULTILINE)
+
+
+def estimate_tokens(text):
+    return (len(text) + 3) // 4
+
+def _echo_answer(prompt):
+    # The section prompts end with "instruction: text", answer with the text so results stay recognisable
+    return "Enhanced: " + prompt.rsplit(":", 1)[-1].strip()
+
+def _json_answer(prompt):
+    # Bundled prompts list one 'Section "name":' block per section, answer each of them
+    blocks = BUNDLED_SECTION.split(prompt)
+    return json.dumps({name: _echo_answer(body) for name, body in zip(blocks[1::2], blocks[2::2])})
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status, message, kind, headers=()):
+        self._send_json(status, {"error": {"message": message, "type": kind}}, headers)
+
+    def do_GET(self):
+        if self.path.endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        else:
+            self._send_error(404, f"unknown path {self.path}", "not_found")
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body can't be skipped without a length, so this connection can't be reused
+            self.close_connection = True
+            self._send_error(400, "invalid Content-Length", "invalid_request_error")
+            return
+        body = self.rfile.read(length)
+        if not self.path.endswith("/chat/completions"):
+            self._send_error(404, f"unknown path {self.path}", "not_found")
+            return
+        try:
+            request = json.loads(body)
+            prompt = request["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send_error(400, "expected a chat completion request", "invalid_request_error")
+            return
+
+        server = self.server
+        config = server.config
+        roll = server.roll()
+        if roll < config.rate_limit_rate:
+            server.count("rate_limited")
+            self._send_error(429, "Rate limit reached (stub)", "rate_limit_exceeded",
+                             [("retry-after", str(config.retry_after))])
+            return
+        if roll < config.rate_limit_rate + config.error_rate:
+            server.count("errors")
+            self._send_error(500, "Injected failure (stub)", "server_error")
+            return
+
+        time.sleep(max(0.0, config.latency + random.uniform(-config.jitter, config.jitter)))
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        answer = server.answer(prompt, json_mode)
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(answer)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        server.count("completed")
+        if request.get("stream"):
+            self._stream(request, answer, usage)
+        else:
+            self._send_json(200, {
+                "id": "stub", "object": "chat.completion", "created": int(time.time()), "model": request.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _stream(self, request, answer, usage):
+        # Server-sent events over chunked encoding, so the connection stays usable afterwards
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send_event(data):
+            payload = f"data: {data}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+            self.wfile.flush()
+
+        chunk = {"id": "stub", "object": "chat.completion.chunk", "model": request.get("model")}
+        for index, token in enumerate(re.findall(r"\S+\s*", answer)):
+            if index and self.server.config.token_interval:
+                time.sleep(self.server.config.token_interval)
+            send_event(json.dumps(dict(chunk, choices=[{"index": 0, "delta": {"content": token}, "finish_reason": None}])))
+        # Groq puts the usage of a stream on its last chunk under x_groq
+        send_event(json.dumps(dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                                   x_groq={"usage": usage})))
+        send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address, config, verbose=False):
+        super().__init__(address, StubRequestHandler)
+        self.config = config
+        self.verbose = verbose
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.next_response = 0
+        self.stats = {"completed": 0, "errors": 0, "rate_limited": 0}
+
+    def roll(self):
+        with self.lock:
+            return self.random.random()
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def answer(self, prompt, json_mode):
+        responses = self.config.responses
+        if isinstance(responses, dict):
+            for needle, answer in responses.items():
+                if needle in prompt:
+                    return answer
+        elif responses:
+            with self.lock:
+                answer = responses[self.next_response % len(responses)]
+                self.next_response += 1
+            return answer
+        return _json_answer(prompt) if json_mode else _echo_answer(prompt)
+
+
+def start_stub_server(config=StubConfig(), host=STUB_HOST, port=0, verbose=False):
+    # Runs in a background thread, port 0 picks a free one. Returns the server, its address is server.server_address.
+    server = StubServer((host, port), config, verbose)
+    threading.Thread(target=server.serve_forever, name="ai-stub-server", daemon=True).start()
+    return server
+
+def stub_base_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/v1"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub of the AI backend.")
+    parser.add_argument("--host", default=STUB_HOST)
+    parser.add_argument("--port", type=int, default=STUB_PORT)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before answering (default: 0.2)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +- seconds added to --latency")
+    parser.add_argument("--token-interval", type=float, default=0.0, help="seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500 (0-1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429 (0-1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--responses", metavar="FILE",
+                        help="JSON file with canned answers: a list used in turn, or {\"text in the prompt\": answer}")
+    parser.add_argument("--seed", type=int, help="seed for injected failures, to make runs repeatable")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    responses = None
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            responses = json.load(f)
+    config = StubConfig(args.latency, args.jitter, args.token_interval, args.error_rate, args.rate_limit_rate,
+                        args.retry_after, responses, args.seed)
+    server = StubServer((args.host, args.port), config, args.verbose)
+    print(f"AI stub listening on http://{args.host}:{args.port}/v1 (Groq SDK: GROQ_BASE_URL=http://{args.host}:{args.port}). "
+          f"Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopping the AI stub: {server.stats}")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+import review_generator as rg
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "review_benchmark.json")
+
+# Named corpus sizes in bytes, "huge" is opt-in (--sizes huge) since it takes a while to write and parse
+SIZES = {
+    "tiny": 1 << 10,
+    "small": 16 << 10,
+    "medium": 1 << 20,
+    "large": 16 << 20,
+    "huge": 100 << 20,
+}
+DEFAULT_SIZES = ["tiny", "small", "medium", "large"]
+
+# A benchmark counts as a regression when its median is this much slower (or its peak memory this much higher)
+DEFAULT_TOLERANCE = 0.25
+
+WORDS = ("the game combat boss level story art music sound world quest enemy weapon skill tree map open "
+         "slow fast fun boring great awful pretty ugly short long hard easy puzzle dialogue character "
+         "ending chapter grind loot craft stealth jump platform camera control frame rate bug patch "
+         "café naïve déjà vu — ✅").split()
+EXTRA_SECTIONS = ["extra", "performance", "price", "notes"]
+
+
+#corpus functions
+def _line(rng, min_words, max_words):
+    return " ".join(rng.choices(WORDS, k=rng.randint(min_words, max_words)))
+
+def _section_budgets(rng, target_bytes):
+    # Pareto weights give a few sections most of the text, like real reviews. Pros/cons get a bigger share
+    # since they turn into one list item per line, which is the expensive part of parsing and rendering.
+    names = ["main", "gameplay", "combat", "art", "story", "pros", "cons", "tldr"]
+    names += rng.sample(EXTRA_SECTIONS, rng.randint(0, len(EXTRA_SECTIONS)))
+    weights = {name: rng.paretovariate(1.2) * (3 if name in ("pros", "cons") else 1) for name in names}
+    total = sum(weights.values())
+    return {name: max(1, int(target_bytes * weight / total)) for name, weight in weights.items()}
+
+def _section_lines(rng, name, budget):
+    written = 0
+    while written < budget:
+        if name in rg.TEXT_SECTIONS:
+            # Paragraphs of long lines with the odd blank line, like the editor produces
+            line = _line(rng, 8, 40) + "." if rng.random() > 0.1 else ""
+        else:
+            # Short bullets with stray indentation and blank lines for the parser to strip
+            line = " " * rng.choice((0, 0, 0, 2)) + _line(rng, 2, 9) if rng.random() > 0.05 else "  "
+        written += len(line) + 1
+        yield line
+
+def write_synthetic_review(path, target_bytes, seed=0):
+    # Same seed and size -> byte-identical file, so numbers from different runs are comparable
+    rng = random.Random(f"{seed}-{target_bytes}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"### game\n{_line(rng, 1, 4).title()}\n\n")
+        for name, budget in _section_budgets(rng, target_bytes).items():
+            header = name if rng.random() > 0.2 else name.upper() + " "
+            f.write(f"### {header}\n")
+            chunk = []
+            for line in _section_lines(rng, name, budget):
+                chunk.append(line)
+                if len(chunk) >= 4096:
+                    f.write("\n".join(chunk) + "\n")
+                    chunk = []
+            f.write("\n".join(chunk) + "\n\n")
+    return path
+
+def corpus_files(directory, sizes, seed=0):
+    # Files are reused when they already exist, a 100 MB review is worth generating only once
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    for name in sizes:
+        path = os.path.join(directory, f"review_{name}_{seed}.txt")
+        if not os.path.exists(path):
+            write_synthetic_review(path, SIZES[name], seed)
+        files[name] = path
+    return files
+#end of corpus functions
+
+
+#benchmark functions
+def time_call(fn, runs):
+    # Median and best milliseconds per call, looping fast calls so every sample lasts at least ~0.2 s
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [seconds / number * 1000 for seconds in timer.repeat(runs, number)]
+    return statistics.median(samples), min(samples)
+
+def peak_memory(fn):
+    # Peak bytes allocated by one call, measured separately since tracemalloc slows everything down
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _write_outputs(directory, bbcode, text):
+    # The same atomic writes (temp file, then rename) the generator uses for its outputs
+    for name, output in (("compiled_review_bbcode.txt", bbcode), ("compiled_review.txt", text)):
+        rg.write_atomic(os.path.join(directory, name), output)
+
+def benchmark_review(path, runs, out_dir):
+    sections = rg.parse_sections(path)
+    review = rg.parse_review(path)
+    bbcode, text = rg.generate_review_outputs(sections)
+    operations = {
+        "parse": lambda: rg.parse_sections(path),
+        "parse_review": lambda: rg.parse_review(path),
+        "render_bbcode": lambda: rg.generate_review_bbcode(sections),
+        "render_text": lambda: rg.generate_review(sections),
+        "render_both": lambda: rg.generate_review_outputs(sections),
+        "render_both_review": lambda: rg.generate_review_outputs(review),
+        "write": lambda: _write_outputs(out_dir, bbcode, text),
+    }
+    results = {}
+    for op, fn in operations.items():
+        median_ms, best_ms = time_call(fn, runs)
+        results[op] = {"median_ms": round(median_ms, 4), "best_ms": round(best_ms, 4), "peak_bytes": peak_memory(fn)}
+    return results
+
+def run_benchmark(sizes, runs, seed=0, corpus_dir=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        files = corpus_files(corpus_dir or tmp, sizes, seed)
+        results = {}
+        for name, path in files.items():
+            file_bytes = os.path.getsize(path)
+            results[name] = {"bytes": file_bytes, "ops": benchmark_review(path, runs, tmp)}
+            parse_ms = results[name]["ops"]["parse"]["median_ms"]
+            print(f"  {name:<7} {file_bytes / (1 << 20):8.2f} MB  parse {parse_ms:9.3f} ms "
+                  f"({file_bytes / (1 << 20) / (parse_ms / 1000):6.1f} MB/s)")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "seed": seed,
+        "sizes": results,
+    }
+#end of benchmark functions
+
+
+def compare(result, baseline, tolerance):
+    # Prints every benchmark next to the baseline, returns the list of regressions
+    regressions = []
+    print(f"{'':<26} {'median':>11} {'baseline':>11} {'ratio':>7}  {'peak':>10} {'baseline':>10}")
+    for name, entry in result["sizes"].items():
+        recorded = (baseline or {}).get("sizes", {}).get(name, {}).get("ops", {})
+        for op, stats in entry["ops"].items():
+            old = recorded.get(op)
+            text = f"{name + ' ' + op:<26} {stats['median_ms']:9.3f}ms"
+            if not old:
+                print(text)
+                continue
+            ratio = stats["median_ms"] / old["median_ms"] if old["median_ms"] else 1.0
+            text += (f" {old['median_ms']:9.3f}ms {ratio:6.2f}x  {stats['peak_bytes'] / 1024:8.0f}kB "
+                     f"{old['peak_bytes'] / 1024:8.0f}kB")
+            slower = ratio > 1 + tolerance
+            bigger = stats["peak_bytes"] > old["peak_bytes"] * (1 + tolerance) + 4096
+            if slower or bigger:
+                regressions.append(f"{name} {op}")
+                text += "   ❌ " + ("slower" if slower else "more memory")
+            print(text)
+    return regressions
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark parsing, rendering and writing reviews on a synthetic corpus.")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help=f"comma separated, from {', '.join(SIZES)} (default: {','.join(DEFAULT_SIZES)})")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="samples per benchmark (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed, keep it fixed to compare runs (default: 0)")
+    parser.add_argument("--corpus", help="keep the generated reviews in this directory and reuse them next time")
+    parser.add_argument("--generate-only", action="store_true", help="write the corpus to --corpus and stop")
+    parser.add_argument("--record", action="store_true", help=f"save the result as the new {os.path.basename(BASELINE_FILE)}")
+    parser.add_argument("--check", action="store_true", help="exit with an error when something regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown / memory growth before --check fails (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    if args.generate_only:
+        if not args.corpus:
+            parser.error("--generate-only needs --corpus DIR")
+        for name, path in corpus_files(args.corpus, sizes, args.seed).items():
+            print(f"✅ {name}: {path} ({os.path.getsize(path)} bytes)")
+        return 0
+
+    baseline = None
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("seed") != args.seed:
+            print("⚠️ The baseline was recorded with a different seed, ratios are not meaningful.")
+
+    print(f"Review pipeline, median of {args.runs} samples (Python {platform.python_version()}):")
+    result = run_benchmark(sizes, args.runs, args.seed, args.corpus)
+    regressions = compare(result, baseline, args.tolerance)
+
+    if args.record:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"Recorded in {os.path.basename(BASELINE_FILE)}.")
+
+    if regressions:
+        print(f"❌ Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
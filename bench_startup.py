@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "startup_benchmark.json")
+
+# Budgets for the plain (non-AI) path, in milliseconds:
+#   import   - cumulative `python -X importtime` time of review_generator
+#   compile  - in a fresh interpreter: importing review_generator and compiling one review (interpreter boot excluded)
+IMPORT_BUDGET_MS = 10
+COMPILE_BUDGET_MS = 15
+
+COMPILE_SNIPPET = ("import time; started = time.perf_counter(); import sys, review_generator as rg; "
+                   "rg.generate_review_outputs(rg.parse_sections(sys.argv[1])); "
+                   "print((time.perf_counter() - started) * 1000)")
+
+
+def _python(args, env=None):
+    return subprocess.run([sys.executable] + args, capture_output=True, text=True, cwd=HERE, env=env, check=True)
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package" -> [(module, nesting level, self_ms, cumulative_ms)]
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), level, int(parts[0]) / 1000, int(parts[1]) / 1000))
+    return entries
+
+def imported_by(entries, module):
+    # importtime lists nested imports right before the module that triggered them, indented one level deeper
+    index = next(i for i, entry in enumerate(entries) if entry[0] == module and entry[1] == 0)
+    start = index
+    while start > 0 and entries[start - 1][1] > 0:
+        start -= 1
+    return entries[start:index + 1]
+
+def measure_import(module, runs):
+    samples = []
+    own = []
+    for _ in range(runs):
+        own = imported_by(parse_importtime(_python(["-X", "importtime", "-c", f"import {module}"]).stderr), module)
+        samples.append(own[-1][3])
+    # Heaviest modules that importing `module` pulled in (last run), by their own (self) time
+    top = sorted(((name, self_ms) for name, _, self_ms, _ in own), key=lambda item: -item[1])[:8]
+    return samples, top
+
+def measure_compile(review, runs):
+    return [float(_python(["-c", COMPILE_SNIPPET, review]).stdout) for _ in range(runs)]
+
+def measure_wall(args, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _python(args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def run_benchmark(runs):
+    # Make sure bytecode is cached so we measure startup and not compiling our own sources
+    _python(["-m", "compileall", "-q", "review_generator.py", "review_generator_ai.py", "ai_scheduler.py", "tracing.py"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        review = os.path.join(tmp, "review.txt")
+        with open(review, "w", encoding="utf-8") as f:
+            f.write("### game\nBenchmark\n### main\nA short review.\n### pros\ngood\n### cons\nbad\n### tldr\nfine\n")
+
+        import_samples, slowest = measure_import("review_generator", runs)
+        ai_import_samples, _ = measure_import("review_generator_ai", runs)
+        bare = measure_wall(["-c", "pass"], runs)
+        compile_samples = measure_compile(review, runs)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "import_ms": statistics.median(import_samples),
+        "ai_import_ms": statistics.median(ai_import_samples),
+        "interpreter_ms": statistics.median(bare),
+        "compile_ms": statistics.median(compile_samples),
+        "slowest_imports": [[name, round(ms, 3)] for name, ms in slowest],
+        "budget": {"import_ms": IMPORT_BUDGET_MS, "compile_ms": COMPILE_BUDGET_MS},
+    }
+
+def report(result, baseline=None):
+    def line(label, key, budget=None):
+        text = f"  {label:<34} {result[key]:7.1f} ms"
+        if baseline and key in baseline:
+            text += f"   (recorded {baseline[key]:.1f} ms)"
+        if budget is not None:
+            text += "   ✅" if result[key] <= budget else f"   ❌ over the {budget} ms budget"
+        print(text)
+
+    print(f"Startup, median of {result['runs']} runs (Python {result['python']}):")
+    line("import review_generator", "import_ms", IMPORT_BUDGET_MS)
+    line("import review_generator_ai", "ai_import_ms")
+    line("bare interpreter", "interpreter_ms")
+    line("import + compile one review", "compile_ms", COMPILE_BUDGET_MS)
+    print("Slowest imports of review_generator (self time):")
+    for name, ms in result["slowest_imports"]:
+        print(f"  {name:<34} {ms:7.3f} ms")
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Measure cold start of the review generator with python -X importtime.")
+    parser.add_argument("-n", "--runs", type=int, default=15, help="fresh interpreters per measurement (default: 15)")
+    parser.add_argument("--record", action="store_true", help=f"save the result as the new {os.path.basename(BASELINE_FILE)}")
+    parser.add_argument("--check", action="store_true", help="exit with an error when a budget is exceeded")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    result = run_benchmark(args.runs)
+    report(result, baseline)
+
+    if args.record:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"Recorded in {os.path.basename(BASELINE_FILE)}.")
+
+    if args.check and (result["import_ms"] > IMPORT_BUDGET_MS or result["compile_ms"] > COMPILE_BUDGET_MS):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,340 @@
+import os
+import re
+import sys
+import json
+import struct
+import sqlite3
+import hashlib
+import argparse
+from itertools import groupby
+from functools import lru_cache
+from contextlib import closing
+from review_generator import parse_sections, collect_review_files
+from review_store import STORE_FILE, review_hash
+
+# Finds pros and cons that say the same thing in slightly different words, across every indexed review.
+# Each distinct bullet gets a MinHash signature of its character shingles. LSH cuts the signature into bands
+# and keeps one hashed key per band, so only bullets sharing a key are ever compared ("candidates"), and
+# candidates are confirmed with their exact Jaccard similarity. Everything lives in SQLite, memory use stays
+# the same however large the corpus gets.
+INDEX_FILE = "bullets.sqlite"
+BULLET_SECTIONS = ("pros", "cons")
+
+SHINGLE_SIZE = 4
+# 12 bands of 4 rows: a pair at Jaccard 0.5 becomes a candidate ~54% of the time, at 0.6 ~81%, at 0.7 ~96%
+LSH_BANDS = 12
+LSH_ROWS = 4
+DEFAULT_THRESHOLD = 0.7
+# A query never verifies more than this many candidates, however common its wording is
+MAX_CANDIDATES = 2000
+# Ids per "IN (?, ...)" query, SQLite before 3.32 allows at most 999 variables in one statement
+SQL_VARIABLES = 500
+
+# One 32-bit hash per signature row, all cut from a single SHAKE-128 digest of the shingle
+_SIGNATURE_ROWS = struct.Struct(f"<{LSH_BANDS * LSH_ROWS}I")
+# Stored band keys depend on these, an index built with other values has to be rebuilt
+INDEX_SETTINGS = json.dumps(["shake128", SHINGLE_SIZE, LSH_BANDS, LSH_ROWS])
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bullets (
+    id INTEGER PRIMARY KEY,
+    section TEXT NOT NULL,
+    norm TEXT NOT NULL,
+    text TEXT NOT NULL,
+    uses INTEGER NOT NULL,
+    UNIQUE (section, norm)
+);
+CREATE TABLE IF NOT EXISTS bullet_bands (
+    key INTEGER NOT NULL,
+    bullet_id INTEGER NOT NULL,
+    PRIMARY KEY (key, bullet_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS indexed_reviews (
+    content_hash TEXT PRIMARY KEY,
+    source TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS index_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+#minhash functions
+def normalize_bullet(text):
+    # Case, punctuation and spacing don't make two bullets different
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+@lru_cache(maxsize=8192)
+def shingles(norm):
+    if len(norm) <= SHINGLE_SIZE:
+        return frozenset([norm])
+    return frozenset([norm[i:i + SHINGLE_SIZE] for i in range(len(norm) - SHINGLE_SIZE + 1)])
+
+def jaccard(a, b):
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+@lru_cache(maxsize=65536)
+def _shingle_digest(shingle):
+    # The same few thousand shingles make up most bullets; kept as bytes, 65536 of them are ~15 MB
+    return hashlib.shake_128(shingle.encode("utf-8")).digest(_SIGNATURE_ROWS.size)
+
+def minhash(shingle_set):
+    # The signature is the smallest hash of each row. Hashing every shingle once and taking the minimums
+    # in C is many times faster than the usual (a*x + b) mod p permutations in Python.
+    unpack = _SIGNATURE_ROWS.unpack
+    return list(map(min, zip(*[unpack(_shingle_digest(shingle)) for shingle in shingle_set])))
+
+def band_keys(signature):
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<B{LSH_ROWS}I", band, *rows), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))  # SQLite integers are signed 64-bit
+    return keys
+#end of minhash functions
+
+
+def open_index(path=INDEX_FILE):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(INDEX_SCHEMA)
+    settings = get_meta(conn, "settings")
+    if settings is None:
+        with conn:
+            set_meta(conn, "settings", INDEX_SETTINGS)
+    elif settings != INDEX_SETTINGS:
+        conn.close()
+        raise RuntimeError(f"{path} was built with other MinHash settings, delete it and index the reviews again")
+    return conn
+
+def get_meta(conn, name):
+    row = conn.execute("SELECT value FROM index_meta WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+def set_meta(conn, name, value):
+    conn.execute("INSERT OR REPLACE INTO index_meta (name, value) VALUES (?, ?)", (name, value))
+
+def _bullet_lines(value):
+    # parse_sections gives lists, a Review one string with a line per bullet
+    if isinstance(value, str):
+        value = value.split("\n")
+    return value or []
+
+def add_bullet(conn, section, text):
+    # Returns True for a wording the index hasn't seen yet, only those need a signature
+    norm = normalize_bullet(text)
+    if not norm:
+        return False
+    cursor = conn.execute("INSERT OR IGNORE INTO bullets (section, norm, text, uses) VALUES (?, ?, ?, 1)",
+                          (section, norm, text.strip()))
+    if cursor.rowcount == 0:
+        conn.execute("UPDATE bullets SET uses = uses + 1 WHERE section = ? AND norm = ?", (section, norm))
+        return False
+    bullet_id = cursor.lastrowid
+    conn.executemany("INSERT OR IGNORE INTO bullet_bands (key, bullet_id) VALUES (?, ?)",
+                     [(key, bullet_id) for key in band_keys(minhash(shingles(norm)))])
+    return True
+
+def index_review(conn, sections, source=None, content_hash=None):
+    # Returns how many new wordings the review added, or None if it was already indexed
+    content_hash = content_hash or review_hash(sections)
+    if conn.execute("INSERT OR IGNORE INTO indexed_reviews (content_hash, source) VALUES (?, ?)",
+                    (content_hash, source)).rowcount == 0:
+        return None
+    return sum(add_bullet(conn, section, text)
+               for section in BULLET_SECTIONS for text in _bullet_lines(sections.get(section)))
+
+def index_review_files(conn, filenames):
+    # Returns (reviews indexed, reviews already indexed, new wordings, errors)
+    indexed = skipped = new = 0
+    errors = []
+    with conn:
+        for filename in filenames:
+            try:
+                added = index_review(conn, parse_sections(filename), os.path.abspath(filename))
+            except (OSError, UnicodeDecodeError) as e:
+                errors.append((filename, str(e)))
+                continue
+            if added is None:
+                skipped += 1
+            else:
+                indexed += 1
+                new += added
+    return indexed, skipped, new, errors
+
+def sync_from_store(conn, store_path=STORE_FILE):
+    # Indexes the reviews added to the review store since the last sync. Returns (reviews indexed, new wordings).
+    from review_store import open_store
+    meta_name = "synced:" + os.path.abspath(store_path)
+    last_id = int(get_meta(conn, meta_name) or 0)
+    indexed = new = 0
+    with closing(open_store(store_path)) as store, conn:
+        rows = store.execute("SELECT id, content_hash, source, sections FROM reviews WHERE id > ? ORDER BY id", (last_id,))
+        for review_id, content_hash, source, sections in rows:
+            added = index_review(conn, json.loads(sections), source, content_hash)
+            if added is not None:
+                indexed += 1
+                new += added
+            last_id = review_id
+        set_meta(conn, meta_name, str(last_id))
+    return indexed, new
+
+
+def similar_bullets(conn, text, section=None, threshold=DEFAULT_THRESHOLD, limit=10):
+    # Returns [(similarity, id, section, text, uses)], most similar first
+    norm = normalize_bullet(text)
+    if not norm:
+        return []
+    query = shingles(norm)
+    keys = band_keys(minhash(query))
+    sql = ("SELECT DISTINCT b.id, b.section, b.norm, b.text, b.uses FROM bullet_bands k "
+           f"JOIN bullets b ON b.id = k.bullet_id WHERE k.key IN ({', '.join('?' * len(keys))})")
+    params = keys
+    if section:
+        sql += " AND b.section = ?"
+        params = keys + [section]
+    matches = []
+    for bullet_id, bullet_section, bullet_norm, bullet_text, uses in conn.execute(sql + f" LIMIT {MAX_CANDIDATES}", params):
+        similarity = jaccard(query, shingles(bullet_norm))
+        if similarity >= threshold:
+            matches.append((similarity, bullet_id, bullet_section, bullet_text, uses))
+    matches.sort(key=lambda match: (-match[0], -match[4]))
+    return matches[:limit]
+
+def duplicate_clusters(conn, threshold=DEFAULT_THRESHOLD, section=None):
+    # Groups near-duplicate wordings, one pass over the band keys in index order. Only bullets that really have
+    # a near duplicate are held in memory. Returns [[(id, section, text, uses), ...]], most used cluster first.
+    parent = {}
+
+    def find(bullet_id):
+        root = bullet_id
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while bullet_id != root:
+            parent[bullet_id], bullet_id = root, parent.get(bullet_id, root)
+        return root
+
+    # Only keys shared by several bullets, walked in primary key order so the buckets come out one after the other.
+    # Most keys belong to a single bullet, SQLite drops those far faster than Python could.
+    sql = ("SELECT k.key, b.id, b.section, b.norm FROM bullet_bands k JOIN bullets b ON b.id = k.bullet_id "
+           "WHERE k.key IN (SELECT key FROM bullet_bands GROUP BY key HAVING count(*) > 1)")
+    bands = conn.execute(sql + " AND b.section = ? ORDER BY k.key" if section else sql + " ORDER BY k.key",
+                         (section,) if section else ())
+    for _, bucket in groupby(bands, key=lambda row: row[0]):
+        members = [row[1:] for row in bucket]
+        if len(members) < 2:
+            continue
+        # Each bullet is compared with the distinct wordings found so far in this bucket, not with every other member
+        representatives = []
+        for bullet_id, bullet_section, norm in members:
+            bullet_shingles = shingles(norm)
+            size = len(bullet_shingles)
+            root = find(bullet_id)
+            for other_id, other_section, other_shingles in representatives:
+                # Jaccard can't exceed the ratio of the two set sizes, pairs that can't reach the threshold stop here
+                other_size = len(other_shingles)
+                if bullet_section != other_section or min(size, other_size) < threshold * max(size, other_size):
+                    continue
+                other_root = find(other_id)
+                if root == other_root or jaccard(bullet_shingles, other_shingles) >= threshold:
+                    parent[root] = other_root
+                    parent.setdefault(other_root, other_root)
+                    break
+            else:
+                representatives.append((bullet_id, bullet_section, bullet_shingles))
+
+    groups = {}
+    for bullet_id in list(parent):
+        groups.setdefault(find(bullet_id), []).append(bullet_id)
+    clusters = []
+    for ids in groups.values():
+        # Single-link chains can grow far past the variable limit, so large clusters are read in batches
+        rows = []
+        for start in range(0, len(ids), SQL_VARIABLES):
+            batch = ids[start:start + SQL_VARIABLES]
+            rows += conn.execute(f"SELECT id, section, text, uses FROM bullets WHERE id IN ({', '.join('?' * len(batch))})",
+                                 batch).fetchall()
+        rows.sort(key=lambda row: (-row[3], row[0]))
+        clusters.append(rows)
+    clusters.sort(key=lambda rows: -sum(row[3] for row in rows))
+    return clusters
+
+def index_stats(conn):
+    bullets, uses = conn.execute("SELECT count(*), coalesce(sum(uses), 0) FROM bullets").fetchone()
+    reviews = conn.execute("SELECT count(*) FROM indexed_reviews").fetchone()[0]
+    keys = conn.execute("SELECT count(*) FROM bullet_bands").fetchone()[0]
+    return {"reviews": reviews, "bullets": bullets, "uses": uses, "band_keys": keys}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="bullet_index.py", description="Find near-duplicate pros and cons across reviews.")
+    parser.add_argument("--db", default=INDEX_FILE, help=f"index file (default: {INDEX_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="index the pros and cons of review files (indexed reviews are skipped)")
+    add_parser.add_argument("targets", nargs="+", help="review files, directories or glob patterns")
+
+    sync_parser = commands.add_parser("sync", help="index the reviews added to the review store since the last sync")
+    sync_parser.add_argument("--store", default=STORE_FILE, help=f"review store (default: {STORE_FILE})")
+
+    similar_parser = commands.add_parser("similar", help="list indexed bullets similar to TEXT")
+    similar_parser.add_argument("text")
+    similar_parser.add_argument("-s", "--section", choices=BULLET_SECTIONS)
+    similar_parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"minimum similarity, 0-1 (default: {DEFAULT_THRESHOLD})")
+    similar_parser.add_argument("-n", "--limit", type=int, default=10)
+
+    dups_parser = commands.add_parser("dups", help="report groups of near-duplicate bullets")
+    dups_parser.add_argument("-s", "--section", choices=BULLET_SECTIONS)
+    dups_parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                             help=f"minimum similarity, 0-1 (default: {DEFAULT_THRESHOLD})")
+    dups_parser.add_argument("-n", "--limit", type=int, default=20, help="groups to print (default: 20)")
+    dups_parser.add_argument("--json", metavar="FILE", help="write every group to FILE as JSON")
+
+    commands.add_parser("stats", help="how much is indexed")
+    args = parser.parse_args(argv)
+
+    try:
+        with closing(open_index(args.db)) as conn:
+            if args.command == "add":
+                indexed, skipped, new, errors = index_review_files(conn, collect_review_files(args.targets))
+                for filename, error in errors:
+                    print(f"❌ {filename}: {error}")
+                print(f"✅ Indexed {indexed} reviews ({new} new bullets), {skipped} already indexed.")
+                return 1 if errors else 0
+            if args.command == "sync":
+                indexed, new = sync_from_store(conn, args.store)
+                print(f"✅ Indexed {indexed} new reviews from {args.store} ({new} new bullets).")
+                return 0
+            if args.command == "similar":
+                for similarity, bullet_id, section, text, uses in similar_bullets(conn, args.text, args.section,
+                                                                                  args.threshold, args.limit):
+                    print(f"{similarity:.2f}  {section:<4}  {uses:>5}x  {text}")
+                return 0
+            if args.command == "dups":
+                clusters = duplicate_clusters(conn, args.threshold, args.section)
+                for rows in clusters[:args.limit]:
+                    print(f"\n{rows[0][1]}: {len(rows)} wordings, used {sum(row[3] for row in rows)} times")
+                    for _, _, text, uses in rows:
+                        print(f"  {uses:>5}x  {text}")
+                if args.json:
+                    with open(args.json, "w", encoding="utf-8") as f:
+                        json.dump([{"section": rows[0][1], "bullets": [{"text": text, "uses": uses} for _, _, text, uses in rows]}
+                                   for rows in clusters], f, ensure_ascii=False, indent=2)
+                print(f"\n{len(clusters)} groups of near-duplicate bullets, "
+                      f"{sum(len(rows) for rows in clusters)} wordings in total.")
+                return 0
+            stats = index_stats(conn)
+            print(f"{stats['reviews']} reviews, {stats['bullets']} distinct bullets used {stats['uses']} times, "
+                  f"{stats['band_keys']} LSH keys in {args.db}.")
+            return 0
+    except (sqlite3.Error, RuntimeError) as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
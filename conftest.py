@@ -0,0 +1 @@
+# The scripts live in the repository root, this file makes plain `pytest` put the root on sys.path
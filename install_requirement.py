@@ -1,18 +1,17 @@
 import subprocess
 import sys
+import importlib.util
 
 def install_requirements():
-    try:
-        import pyperclip
-    except ImportError:
+    # find_spec only looks a package up, it doesn't import it (importing groq alone takes a while)
+    if importlib.util.find_spec("pyperclip") is None:
         print("pyperclip is not installed. Installing now...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyperclip"])
 
-    try:
-        import groq
-    except ImportError:
+    if importlib.util.find_spec("groq") is None:
         print("groq is not installed. Installing now...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "groq"])
 
-# Call this function at the beginning of your script to ensure dependencies are installed
-install_requirements()
+# Run this file to install the dependencies, importing it has no side effects
+if __name__ == "__main__":
+    install_requirements()
@@ -0,0 +1,268 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from review_generator import SECTION_KINDS, iter_sections, generate_review_outputs, plan_compiled_outputs, write_atomic
+
+# Only ever listens on the local machine, there is no authentication
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+# Names a request may use for the daemon. Checking Host stops DNS rebinding (a web page whose domain
+# suddenly resolves to 127.0.0.1), checking Origin and Content-Type stops other sites posting to it.
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+class ReviewRequestError(Exception):
+    pass
+
+
+def parse_review_text(text):
+    return dict(iter_sections(io.StringIO(text)))
+
+def _sections_from_payload(payload):
+    # A request carries either the raw review text or already parsed sections
+    if isinstance(payload.get("text"), str):
+        return parse_review_text(payload["text"])
+    if isinstance(payload.get("sections"), dict):
+        sections = {}
+        for name, value in payload["sections"].items():
+            # List sections (pros, cons and unknown ones) may come as a list of lines, like /compile returns them
+            is_list = SECTION_KINDS.get(name, "list") == "list"
+            if is_list and isinstance(value, list) and all(isinstance(item, str) for item in value):
+                value = "\n".join(value)
+            if not isinstance(value, str):
+                raise ReviewRequestError(f"section \"{name}\" must be a string" + (" or a list of strings" if is_list else ""))
+            sections[name] = value
+        return sections
+    raise ReviewRequestError("send the review as \"text\" (string) or \"sections\" (object)")
+
+def handle_compile(server, payload):
+    sections = _sections_from_payload(payload)
+    bbcode, text = generate_review_outputs(sections)
+    return {"bbcode": bbcode, "text": text, "sections": sections}
+
+def handle_enhance(server, payload):
+    if not server.api_key:
+        raise ReviewRequestError("the daemon was started without --ai")
+    from review_generator_ai import enhance_sections
+    sections = _sections_from_payload(payload)
+    keys = payload.get("keys")
+    if keys is not None and not (isinstance(keys, list) and all(isinstance(key, str) for key in keys)):
+        raise ReviewRequestError("\"keys\" must be a list of section names")
+    if payload.get("cache", "use") not in ("use", "refresh", "off"):
+        raise ReviewRequestError("\"cache\" must be \"use\", \"refresh\" or \"off\"")
+    if not isinstance(payload.get("bundle", False), bool):
+        raise ReviewRequestError("\"bundle\" must be true or false")
+    options = server.ai_options._replace(**{name: payload[name] for name in ("cache", "bundle") if name in payload})
+    enhanced = enhance_sections(sections, server.api_key, options, keys)
+    return {"enhanced": enhanced}
+
+ROUTES = {
+    "/compile": handle_compile,
+    "/enhance": handle_enhance,
+}
+
+
+class ReviewRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so a client can send many requests over one connection
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _is_local(self, url):
+        try:
+            name = urllib.parse.urlsplit(url).hostname
+        except ValueError:
+            return False
+        return name in LOCAL_HOSTS or name == self.server.server_address[0]
+
+    def _forbidden_reason(self):
+        if not self._is_local("//" + (self.headers.get("Host") or "")):
+            return "requests must be addressed to the local daemon (Host header)"
+        origin = self.headers.get("Origin")
+        if origin is not None and not self._is_local(origin):
+            return "cross-origin requests are not allowed"
+        return None
+
+    def _refuse(self, status, message):
+        # Sent before the body is read, so the connection can't be reused
+        self._send_json(status, {"error": message})
+        self.close_connection = True
+
+    def do_GET(self):
+        reason = self._forbidden_reason()
+        if reason:
+            self._refuse(403, reason)
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok", "ai": bool(self.server.api_key),
+                                  "uptime": round(time.monotonic() - self.server.started, 1)})
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        reason = self._forbidden_reason()
+        if reason:
+            self._refuse(403, reason)
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._refuse(415, "send the request as Content-Type: application/json")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._refuse(400, "invalid Content-Length")
+            return
+        if length > MAX_REQUEST_BYTES:
+            self._refuse(413, "request too large")
+            return
+        body = self.rfile.read(length)  # always read it, or the next request on this connection starts mid-body
+        handler = ROUTES.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ReviewRequestError("the request body must be a JSON object")
+            self._send_json(200, handler(self.server, payload))
+        except (ValueError, ReviewRequestError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+
+class ReviewDaemon(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 resets connections as soon as a batch job fires in parallel
+
+
+def create_daemon(host=DAEMON_HOST, port=DAEMON_PORT, use_ai=False, concurrency=4, verbose=False, backend="groq",
+                  base_url=None, model=None):
+    server = ReviewDaemon((host, port), ReviewRequestHandler)
+    server.verbose = verbose
+    server.started = time.monotonic()
+    server.api_key = None
+    server.ai_options = None
+    if use_ai:
+        # Validated once, then the client, cache and rate limits stay warm for every request
+        from review_generator_ai import AIOptions, load_ai_token
+        server.ai_options = AIOptions(concurrency=concurrency, backend=backend, base_url=base_url)
+        if model:
+            server.ai_options = server.ai_options._replace(model=model)
+        server.api_key = load_ai_token(options=server.ai_options)
+    return server
+
+def start_daemon(host=DAEMON_HOST, port=0, **settings):
+    # Runs in a background thread, port 0 picks a free one. Returns the server, its address is server.server_address.
+    server = create_daemon(host, port, **settings)
+    threading.Thread(target=server.serve_forever, name="review-daemon", daemon=True).start()
+    return server
+
+def serve(host=DAEMON_HOST, port=DAEMON_PORT, use_ai=False, concurrency=4, verbose=False, backend="groq",
+          base_url=None, model=None):
+    server = create_daemon(host, port, use_ai, concurrency, verbose, backend, base_url, model)
+    print(f"Review daemon listening on http://{host}:{port} (AI {'enabled' if server.api_key else 'disabled'}). Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping the review daemon.")
+    finally:
+        server.server_close()
+
+
+#client
+def call_daemon(path, payload, host=DAEMON_HOST, port=DAEMON_PORT, timeout=300):
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        raise ReviewRequestError(json.load(e).get("error", str(e)))
+    except urllib.error.URLError as e:
+        raise ReviewRequestError(f"review daemon not reachable on {host}:{port} ({e.reason}), "
+                                 f"start it with: python review_daemon.py serve")
+
+def _read_review(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return f.read()
+
+def client_compile(args):
+    plan = {} if args.stdout else plan_compiled_outputs(args.files, args.output_dir)
+    for filename in args.files:
+        result = call_daemon("/compile", {"text": _read_review(filename)}, args.host, args.port)
+        if args.stdout:
+            print(result["bbcode"])
+            continue
+        bbcode_path, text_path = plan[filename]
+        write_atomic(bbcode_path, result["bbcode"])
+        write_atomic(text_path, result["text"])
+        print(f"✅ {filename} -> {bbcode_path}, {text_path}")
+    return 0
+
+def client_enhance(args):
+    payload = {"text": _read_review(args.file)}
+    if args.keys:
+        payload["keys"] = args.keys.split(",")
+    result = call_daemon("/enhance", payload, args.host, args.port)
+    print(json.dumps(result["enhanced"], indent=2, ensure_ascii=False))
+    return 0
+#end of client
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="review_daemon.py",
+                                     description="Keep the review generator warm and compile/enhance reviews over local HTTP (JSON).")
+    parser.add_argument("--host", default=DAEMON_HOST)
+    parser.add_argument("--port", type=int, default=DAEMON_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the daemon")
+    serve_parser.add_argument("--ai", action="store_true", help="load and validate token.txt so /enhance works")
+    serve_parser.add_argument("-c", "--concurrency", type=int, default=4, help="AI calls per /enhance request")
+    serve_parser.add_argument("--backend", default="groq", help="AI backend for /enhance: groq (default) or openai")
+    serve_parser.add_argument("--base-url", help="AI API address, e.g. http://127.0.0.1:8000/v1 for ai_stub_server.py")
+    serve_parser.add_argument("--model", help="model to ask (default: the AI script's default)")
+    serve_parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+
+    compile_parser = commands.add_parser("compile", help="compile review files through the daemon")
+    compile_parser.add_argument("files", nargs="+")
+    compile_parser.add_argument("-o", "--output-dir", help="write outputs here instead of next to each input")
+    compile_parser.add_argument("--stdout", action="store_true", help="print the BBCode instead of writing files")
+
+    enhance_parser = commands.add_parser("enhance", help="enhance a review's sections with AI through the daemon")
+    enhance_parser.add_argument("file")
+    enhance_parser.add_argument("--keys", help="comma separated sections to enhance (default: all non-empty)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.host, args.port, args.ai, args.concurrency, args.verbose, args.backend, args.base_url, args.model)
+        return 0
+    try:
+        return client_compile(args) if args.command == "compile" else client_enhance(args)
+    except (OSError, ValueError, ReviewRequestError) as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,14 +1,13 @@
-import ctypes
-import win32clipboard
+# Only what the plain compile path needs is imported here. Editors, clipboard backends, process pools
+# and the like are imported where they are first used, so starting up stays fast (see bench_startup.py).
+import io
 import os
-import subprocess
-import platform
-import pyperclip
-
-def delete_old_files():
-    for fname in ["compiled_review_bbcode.txt", "compiled_review.txt"]:
-        if os.path.exists(fname):
-            os.remove(fname)
+import sys
+import mmap
+import time
+import struct
+from collections import namedtuple
+from tracing import span, run_instrumented
 
 def generate_default_review():
     with open("review.txt", "w", encoding="utf-8") as f:
@@ -54,6 +53,8 @@ def ensure_review_exists():
         print("New review.txt generated.\n")
 
 def open_editor_and_wait(filename):
+    import platform
+    import subprocess
     system = platform.system()
 
     if system == "Windows":
@@ -70,160 +71,741 @@ def open_editor_and_wait(filename):
         print("Unsupported OS. Please edit the file manually and run this again.")
 
 def open_output_in_editor():
-    subprocess.Popen(["notepad", "compiled_review.txt"])
-    
-def build_bbcode_clipboard_fragment(bbcode_fragment):
-    bbcode = f"{bbcode_fragment}"
-    return bbcode.encode("utf-16le")
+    import platform
+    import subprocess
+    system = platform.system()
+    if system == "Windows":
+        subprocess.Popen(["notepad", "compiled_review.txt"])
+    elif system == "Linux":
+        subprocess.Popen(["xdg-open", "compiled_review.txt"])
+    elif system == "Darwin":
+        subprocess.Popen(["open", "-a", "TextEdit", "compiled_review.txt"])
 
-def copy_bbcode_to_clipboard(bbcode_fragment):
-    # Assuming the fragment is properly encoded in UTF-16LE (if you really need that)
-    bbcode_clipboard = build_bbcode_clipboard_fragment(bbcode_fragment)
-    
-    # Ensure the text is in a format pyperclip can handle (plain string, not raw bytes)
-    # We need to decode it to a Python string if it's in UTF-16LE
-    if isinstance(bbcode_clipboard, bytes):
-        bbcode_clipboard = bbcode_clipboard.decode('utf-16le')
+_clipboard_backend = None
 
-    # Now copy it to the clipboard
-    pyperclip.copy(bbcode_clipboard)
+def _copy_with_win32clipboard(text):
+    import win32clipboard
+    win32clipboard.OpenClipboard()
+    try:
+        win32clipboard.EmptyClipboard()
+        win32clipboard.SetClipboardText(text, win32clipboard.CF_UNICODETEXT)
+    finally:
+        win32clipboard.CloseClipboard()
+
+def _copy_with_pyperclip(text):
+    import pyperclip
+    pyperclip.copy(text)
+
+def _copy_with_command(command, env=None):
+    def copy(text):
+        import subprocess
+        subprocess.run(command, input=text.encode("utf-8"), env=env, check=True)
+    return copy
+
+def _pick_clipboard_backend():
+    import shutil
+    import platform
+    import importlib.util
+    system = platform.system()
+    if system == "Windows":
+        if importlib.util.find_spec("win32clipboard"):
+            return _copy_with_win32clipboard
+    elif system == "Darwin":
+        # pbcopy reads the text in the locale's encoding
+        return _copy_with_command(["pbcopy"], dict(os.environ, LC_CTYPE="UTF-8"))
+    elif system == "Linux":
+        if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-copy"):
+            return _copy_with_command(["wl-copy"])
+        if shutil.which("xclip"):
+            return _copy_with_command(["xclip", "-selection", "clipboard"])
+        if shutil.which("xsel"):
+            return _copy_with_command(["xsel", "--clipboard", "--input"])
+    return _copy_with_pyperclip
+
+def get_clipboard_backend():
+    # Chosen once, on first use, for the OS we are running on
+    global _clipboard_backend
+    if _clipboard_backend is None:
+        _clipboard_backend = _pick_clipboard_backend()
+    return _clipboard_backend
 
+def copy_bbcode_to_clipboard(bbcode_fragment):
+    # Every backend takes the str as-is and does its own (single) encoding: CF_UNICODETEXT on Windows,
+    # UTF-8 for the command line tools
+    get_clipboard_backend()(bbcode_fragment)
+
+
+# The known sections, in the order they are rendered, and how each one is kept:
+#   "text" - one block of text
+#   "list" - one entry per non-blank line (parse_sections returns a list, Review one string with a line per item)
+# Sections not listed here are kept as lists too.
+SECTION_SCHEMA = (
+    ("game", "text"),
+    ("main", "text"),
+    ("gameplay", "text"),
+    ("combat", "text"),
+    ("art", "text"),
+    ("story", "text"),
+    ("pros", "list"),
+    ("cons", "list"),
+    ("tldr", "text"),
+)
+SECTION_NAMES = tuple(name for name, _ in SECTION_SCHEMA)
+SECTION_KINDS = dict(SECTION_SCHEMA)
+TEXT_SECTIONS = frozenset(name for name, kind in SECTION_SCHEMA if kind == "text")
+
+def _iter_lines(source):
+    if isinstance(source, mmap.mmap):
+        for raw in iter(source.readline, b""):
+            yield raw.decode("utf-8")
+    else:
+        for line in source:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            yield line
+
+def iter_sections(source, compact=False):
+    # Yields (section, content) once per "### " header in a single pass over a file object or mmap.
+    # Only the section currently being read is kept in memory, so huge concatenated dumps are fine.
+    # compact yields list sections as one string with a line per item instead of a list (see Review).
+    header_names = {}
+    current_section = None
+    is_text = False
+    buffer = []
+    for line in _iter_lines(source):
+        line = line.rstrip()
+        if line.startswith("### "):
+            if current_section:
+                yield current_section, '\n'.join(buffer).strip() if is_text else '\n'.join(buffer) if compact else buffer
+            current_section = header_names.get(line)
+            if current_section is None:
+                current_section = sys.intern(line[4:].strip().lower())
+                if len(header_names) < 256:
+                    header_names[line] = current_section
+            is_text = current_section in TEXT_SECTIONS
+            buffer = []
+        elif current_section:
+            if is_text:
+                buffer.append(line)
+            else:
+                line = line.strip()
+                if line:
+                    buffer.append(line)
+    if current_section:
+        yield current_section, '\n'.join(buffer).strip() if is_text else '\n'.join(buffer) if compact else buffer
 
 def parse_sections(filename):
-    sections = {}
-    current_section = None
     with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.rstrip()
-            if line.startswith("### "):
-                current_section = line[4:].strip().lower()
-                sections[current_section] = []
-            elif current_section:
-                sections[current_section].append(line)
-    return {
-        key: '\n'.join(value).strip() if key in ['main','gameplay','combat','art','story', 'tldr', 'game'] 
-        else [line.strip() for line in value if line.strip()]
-        for key, value in sections.items()
-    }
+        # A repeated header replaces the earlier section, same as before
+        return dict(iter_sections(f))
+
+def parse_review(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        return Review(iter_sections(f, compact=True))
+
+#review model
+class Review:
+    # A parsed review for holding many at once: one slot per known section instead of a dict, and list
+    # sections (pros, cons) kept as a single string with one item per line instead of a list of strings.
+    # A section that wasn't in the file is None. Unknown sections go to `extra` ({name: items string}).
+    __slots__ = SECTION_NAMES + ("extra",)
+
+    def __init__(self, sections=()):
+        # sections: a dict like parse_sections returns, or (name, content) pairs like iter_sections yields
+        for name in SECTION_NAMES:
+            setattr(self, name, None)
+        self.extra = None
+        for name, value in (sections.items() if isinstance(sections, dict) else sections):
+            self.set(name, value)
+
+    def set(self, name, value):
+        if isinstance(value, list):
+            value = '\n'.join(value)
+        if name in SECTION_KINDS:
+            setattr(self, name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+    def get(self, name, default=None):
+        # Same as dict.get on parse_sections' result, except list sections come back in their compact form
+        value = getattr(self, name) if name in SECTION_KINDS else (self.extra or {}).get(name)
+        return default if value is None else value
+
+    def items(self, name):
+        # A list section as a list of lines
+        value = self.get(name)
+        return value.split('\n') if value else []
+
+    def to_dict(self):
+        # The same dict parse_sections would have returned
+        sections = {}
+        for name, kind in SECTION_SCHEMA:
+            if getattr(self, name) is not None:
+                sections[name] = self.items(name) if kind == "list" else getattr(self, name)
+        for name in (self.extra or ()):
+            sections[name] = self.items(name)
+        return sections
+
+    def __eq__(self, other):
+        return isinstance(other, Review) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Review(game={self.game!r})"
+#end of review model
+
+#render engine
+# A format is a list of steps: (section, prefix, transform, suffix).
+#   transform None         -> the section text as-is
+#   transform "nonblank"   -> the section text without its blank lines
+#   transform "...{}..."   -> template applied to every item of a list section, one per line
+# A step is skipped when its section is blank, except for sections listed in REQUIRED_SECTIONS.
+REQUIRED_SECTIONS = {"game": "Unknown Game"}
+
+BBCODE_FORMAT = [
+    ("game", "[B][SIZE=6]", None, "[/SIZE][/B]\n\n"),
+    ("main", "", "nonblank", "\n\n"),
+    ("gameplay", "", "nonblank", "\n\n"),
+    ("combat", "", "nonblank", "\n\n"),
+    ("art", "", "nonblank", "\n\n"),
+    ("story", "", "nonblank", "\n\n"),
+    ("pros", "[COLOR=rgb(0, 128, 0)][B]Pros[/B][/COLOR]\n", "[COLOR=rgb(0, 128, 0)] +[/COLOR] {}", "\n\n"),
+    ("cons", "[COLOR=rgb(184, 49, 47)][B]Cons[/B][/COLOR]\n", "[COLOR=rgb(184, 49, 47)] -[/COLOR] {}", "\n\n"),
+    ("tldr", "[B][COLOR=rgb(255, 165, 0)]TL;DR:[/COLOR][/B] ", None, "\n"),
+]
+
+TEXT_FORMAT = [
+    ("game", "[", None, "]\n"),
+    ("main", "", None, "\n\n"),
+    ("gameplay", "", None, "\n\n"),
+    ("combat", "", None, "\n\n"),
+    ("art", "", None, "\n\n"),
+    ("story", "", None, "\n\n"),
+    ("pros", "Pros\n", "+{}", "\n\n"),
+    ("cons", "Cons\n", "-{}", "\n\n"),
+    ("tldr", "Tl;Dr\n", None, ""),
+]
+
+# Formats whose whole output is stripped at the end
+STRIPPED_FORMATS = {"text"}
+
+# fetch: reads every section of a plan from a Review in one call, None when the plan uses unknown sections
+RenderPlan = namedtuple("RenderPlan", ["formats", "steps", "fetch"])
+
+def _nonblank_lines(value):
+    return '\n'.join([line for line in value.split('\n') if line.strip()])
+
+def _compile_transform(transform):
+    if transform is None:
+        return None
+    if transform == "nonblank":
+        return _nonblank_lines
+    # "head{}tail" over [a, b] -> "head" + "a" + "tail\nhead" + "b" + "tail", a single join for the whole list
+    head, tail = transform.split("{}", 1)
+    separator = tail + '\n' + head
+
+    def render_items(items):
+        if isinstance(items, str):  # a Review keeps the items as lines of one string
+            return head + items.replace('\n', separator) + tail
+        return head + separator.join(items) + tail
+    return render_items
+
+def compile_render_plan(formats):
+    # Turns {format name: steps} into one list of (section, default, [(format index, prefix, fn, suffix)])
+    # so a review is rendered into every format while visiting each section once.
+    names = list(formats)
+    order = []
+    per_section = {}
+    for index, name in enumerate(names):
+        position = 0
+        for section, prefix, transform, suffix in formats[name]:
+            if section not in per_section:
+                per_section[section] = []
+                order.insert(position, section)
+            elif order.index(section) < position:
+                raise ValueError(f"Format '{name}' lists '{section}' in a different order than the other formats.")
+            per_section[section].append((index, prefix, _compile_transform(transform), suffix))
+            position = order.index(section) + 1
+    steps = [(section, REQUIRED_SECTIONS.get(section), per_section[section]) for section in order]
+    fetch = None
+    if len(order) > 1 and all(section in SECTION_KINDS for section in order):
+        from operator import attrgetter
+        fetch = attrgetter(*order)
+    return RenderPlan(names, steps, fetch)
+
+def render_review(sections, plan):
+    # sections: a dict from parse_sections or a Review
+    buffers = [[] for _ in plan.formats]
+    if plan.fetch is not None and type(sections) is Review:
+        values = plan.fetch(sections)
+    else:
+        get = sections.get
+        values = [get(section) for section, _, _ in plan.steps]
+    for (section, default, section_steps), value in zip(plan.steps, values):
+        if value is None:
+            value = default
+        if default is None and not (value.strip() if isinstance(value, str) else value):
+            continue
+        for index, prefix, transform, suffix in section_steps:
+            buffers[index].extend((prefix, value if transform is None else transform(value), suffix))
+    return {name: ''.join(out).strip() if name in STRIPPED_FORMATS else ''.join(out)
+            for name, out in zip(plan.formats, buffers)}
+
+REVIEW_PLAN = compile_render_plan({"bbcode": BBCODE_FORMAT, "text": TEXT_FORMAT})
+BBCODE_PLAN = compile_render_plan({"bbcode": BBCODE_FORMAT})
+TEXT_PLAN = compile_render_plan({"text": TEXT_FORMAT})
+
+def generate_review_outputs(sections):
+    # Both outputs from a single pass over the sections
+    rendered = render_review(sections, REVIEW_PLAN)
+    return rendered["bbcode"], rendered["text"]
 
 def generate_review_bbcode(sections):
-    game_info = sections.get("game", "Unknown Game")
-    yapping = sections.get("main", "")
-    gameplay = sections.get("gameplay", "")
-    combat = sections.get("combat", "")
-    art = sections.get("art", "")
-    story = sections.get("story", "")
-    pros = sections.get("pros", [])
-    cons = sections.get("cons", [])
-    tldr = sections.get("tldr", "")
-
-    # BBCode formatting for the title
-    title_bbcode = f'[B][SIZE=6]{game_info}[/SIZE][/B]\n\n'
-
-    # Main body with newline after each line, check if content exists
-    body_bbcode = '\n'.join([f'{line}' for line in yapping.split('\n') if line.strip()])
-    if body_bbcode:  # Only add newline if body has content
-        body_bbcode += '\n\n'
-    
-    body1_bbcode = '\n'.join([f'{line}' for line in gameplay.split('\n') if line.strip()])
-    if body1_bbcode:  
-        body1_bbcode += '\n\n'
-    
-    body2_bbcode = '\n'.join([f'{line}' for line in combat.split('\n') if line.strip()])
-    if body2_bbcode: 
-        body2_bbcode += '\n\n'
-    
-    body3_bbcode = '\n'.join([f'{line}' for line in art.split('\n') if line.strip()])
-    if body3_bbcode:  
-        body3_bbcode += '\n\n'
-    
-    body4_bbcode = '\n'.join([f'{line}' for line in story.split('\n') if line.strip()])
-    if body4_bbcode:  
-        body4_bbcode += '\n\n'
-
-    pros_bbcode = ''
-    if pros:  
-        pros_bbcode = '[COLOR=rgb(0, 128, 0)][B]Pros[/B][/COLOR]\n'
-        pros_bbcode += '\n'.join([f'[COLOR=rgb(0, 128, 0)] +[/COLOR] {p}' for p in pros]) + '\n\n'
-
-    cons_bbcode = ''
-    if cons:  
-        cons_bbcode = '[COLOR=rgb(184, 49, 47)][B]Cons[/B][/COLOR]\n'
-        cons_bbcode += '\n'.join([f'[COLOR=rgb(184, 49, 47)] -[/COLOR] {c}' for c in cons]) + '\n\n'
-
-    tldr_bbcode = ''
-    if tldr.strip():  
-        tldr_bbcode = '[B][COLOR=rgb(255, 165, 0)]TL;DR:[/COLOR][/B] ' 
-        tldr_bbcode += f'{tldr}\n'
-
-    # Combine everything with appropriate line breaks between sections
-    return title_bbcode + body_bbcode + body1_bbcode + body2_bbcode + body3_bbcode + body4_bbcode + pros_bbcode + cons_bbcode + tldr_bbcode
-
-    
+    return render_review(sections, BBCODE_PLAN)["bbcode"]
+
 def generate_review(sections):
-    game_info = sections.get("game", "Unknown Game")
-    yapping = sections.get("main", "")
-    gameplay = sections.get("gameplay", "")
-    combat = sections.get("combat", "")
-    art = sections.get("art", "")
-    story = sections.get("story", "")
-    pros = sections.get("pros", [])
-    cons = sections.get("cons", [])
-    tldr = sections.get("tldr", "")
-
-    pros_text = '\n'.join([f'+{p}' for p in pros]) if pros else ""
-    cons_text = '\n'.join([f'-{c}' for c in cons]) if cons else ""
-
-    # Start building the review string
-    review = f"[{game_info}]\n"
-
-    # Only add sections if they contain content
-    if yapping.strip():
-        review += f"{yapping}\n\n"
-    
-    if gameplay.strip():
-        review += f"{gameplay}\n\n"
-    
-    if combat.strip():
-        review += f"{combat}\n\n"
-    
-    if art.strip():
-        review += f"{art}\n\n"
-    
-    if story.strip():
-        review += f"{story}\n\n"
-    
-    if pros_text:
-        review += f"Pros\n{pros_text}\n\n"
-    
-    if cons_text:
-        review += f"Cons\n{cons_text}\n\n"
-        
-    if tldr.strip():
-        review += f"Tl;Dr\n{tldr}"
-
-    return review.strip()  # Remove any trailing spaces/newlines
-
-
-    
-if __name__ == "__main__":
-    delete_old_files()
-    ensure_review_exists()
-    open_editor_and_wait("review.txt")
+    return render_review(sections, TEXT_PLAN)["text"]
 
-    try:
-        sections = parse_sections("review.txt")
-        compiled_bbcode = generate_review_bbcode(sections)
-        compiled_text = generate_review(sections)
+#end of render engine
 
-        with open("compiled_review_bbcode.txt", "w", encoding="utf-8") as out:
-            out.write(compiled_bbcode)
-        with open("compiled_review.txt", "w", encoding="utf-8") as out:
-            out.write(compiled_text)
+#output functions
+# Reading the umask means setting it, which other threads could notice, so it's read once while importing
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
-        copy_bbcode_to_clipboard(compiled_bbcode)
-        print("\n✅ Styled review copied to clipboard (BBCode)!")
-        open_output_in_editor()
+def write_atomic(path, data):
+    import tempfile
+    # Write next to the target and rename over it, so nobody ever sees a half-written file
+    # and a crash leaves the previous version in place. data is str (written as UTF-8) or bytes.
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        if isinstance(data, bytes):
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                out.write(data)
+        # mkstemp creates the file as 0600, keep the mode of the file being replaced or use what open() would
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# A sink puts the compiled review somewhere: sink(bbcode, text). The sinks of a run work at the same time,
+# each on its own thread, so a slow clipboard never holds up the files.
+ARCHIVE_DIR = "review_archive"
+DEFAULT_SINKS = ("file", "clipboard")
+
+def _file_sink(bbcode, text):
+    write_atomic("compiled_review_bbcode.txt", bbcode)
+    write_atomic("compiled_review.txt", text)
+
+def _clipboard_sink(bbcode, text):
+    copy_bbcode_to_clipboard(bbcode)
+
+def _stdout_sink(bbcode, text):
+    sys.stdout.write(bbcode + "\n")
+    sys.stdout.flush()
+
+def _archive_sink(bbcode, text):
+    import gzip
+    # One gzipped copy of both outputs per run, named after when it was compiled
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    stamp = time.strftime("review_%Y%m%d-%H%M%S", time.localtime(seconds)) + f".{nanoseconds // 1_000_000:03d}"
+    # Claim the name first, two runs in the same millisecond must not overwrite each other's copies
+    for attempt in range(1000):
+        base = os.path.join(ARCHIVE_DIR, stamp + (f"-{attempt}" if attempt else ""))
+        try:
+            os.close(os.open(base + ".txt.gz", os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            break
+        except FileExistsError:
+            continue
+    else:
+        raise FileExistsError(f"no free archive name for {stamp} in {ARCHIVE_DIR}")
+    write_atomic(base + "_bbcode.txt.gz", gzip.compress(bbcode.encode("utf-8")))
+    write_atomic(base + ".txt.gz", gzip.compress(text.encode("utf-8")))
+
+OUTPUT_SINKS = {
+    "file": _file_sink,
+    "clipboard": _clipboard_sink,
+    "stdout": _stdout_sink,
+    "archive": _archive_sink,
+}
+
+SINK_MESSAGES = {
+    "clipboard": "✅ Styled review copied to clipboard (BBCode)!",
+    "archive": f"✅ Review archived in {ARCHIVE_DIR}.",
+}
+
+def register_output_sink(name, sink, message=None):
+    OUTPUT_SINKS[name] = sink
+    if message:
+        SINK_MESSAGES[name] = message
+
+def parse_sinks(spec):
+    names = tuple(dict.fromkeys(name.strip() for name in spec.split(",") if name.strip()))
+    unknown = [name for name in names if name not in OUTPUT_SINKS]
+    if unknown:
+        raise ValueError(f"Unknown output(s) {', '.join(unknown)}, choose from: {', '.join(OUTPUT_SINKS)}")
+    return names
+
+def run_output_sinks(bbcode, text, names=DEFAULT_SINKS):
+    # Returns {sink name: the exception it raised, or None}
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run(name):
+        with span(f"sink {name}"):
+            try:
+                OUTPUT_SINKS[name](bbcode, text)
+            except Exception as e:
+                return e
+        return None
+
+    if len(names) == 1:
+        return {names[0]: run(names[0])}
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="sink") as pool:
+        return dict(zip(names, pool.map(run, names)))
+
+def deliver_review_outputs(bbcode, text, names=DEFAULT_SINKS):
+    # Runs the sinks and reports on them. Only a failed file sink is an error, the review is in the
+    # files either way and the clipboard can be tried again.
+    errors = run_output_sinks(bbcode, text, names)
+    print()
+    for name, error in errors.items():
+        if error is None:
+            if name in SINK_MESSAGES:
+                print(SINK_MESSAGES[name])
+        elif name != "file":
+            print(f"⚠️ Could not send the review to {name}: {error}")
+    if errors.get("file") is not None:
+        raise errors["file"]
+    return errors
+#end of output functions
+
+#batch functions
+def compiled_output_paths(filename, output_dir=None):
+    # review.txt -> compiled_review_bbcode.txt / compiled_review.txt, same as the interactive run
+    base = os.path.splitext(os.path.basename(filename))[0]
+    out_dir = output_dir if output_dir else os.path.dirname(filename)
+    return (os.path.join(out_dir, f"compiled_{base}_bbcode.txt"),
+            os.path.join(out_dir, f"compiled_{base}.txt"))
+
+def plan_compiled_outputs(files, output_dir=None):
+    # {input: (bbcode path, text path)} for a whole batch. With output_dir, the folders of each input below
+    # the folder all inputs share are mirrored there, so arch/a/review.txt and arch/b/review.txt don't
+    # overwrite each other. Output folders are created; two inputs that would still share outputs are an error.
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files]) if output_dir and files else None
+    plan = {}
+    claimed = {}
+    for filename in files:
+        out_dir = None
+        if root:
+            out_dir = os.path.normpath(os.path.join(output_dir, os.path.relpath(os.path.dirname(os.path.abspath(filename)), root)))
+        paths = compiled_output_paths(filename, out_dir)
+        for path in paths:
+            key = os.path.normcase(os.path.abspath(path))
+            if key in claimed:
+                raise ValueError(f"{claimed[key]} and {filename} would both be compiled to {path}")
+            claimed[key] = filename
+        plan[filename] = paths
+    for out_dir in {os.path.dirname(paths[0]) for paths in plan.values()}:
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+    return plan
+
+def compile_review_file(filename, output_dir=None, output_paths=None):
+    sections = parse_review(filename)
+    compiled_bbcode, compiled_text = generate_review_outputs(sections)
+
+    bbcode_path, text_path = output_paths or compiled_output_paths(filename, output_dir)
+    write_atomic(bbcode_path, compiled_bbcode)
+    write_atomic(text_path, compiled_text)
+    return bbcode_path, text_path
+
+def _compile_review_job(job):
+    # Runs inside a worker process, errors are sent back instead of killing the pool
+    filename, output_paths = job
+    try:
+        compile_review_file(filename, output_paths=output_paths)
+        return filename, None
+    except Exception as e:
+        return filename, f"{type(e).__name__}: {e}"
+
+def collect_review_files(targets):
+    import glob
+    files = []
+    for target in targets:
+        if os.path.isdir(target):
+            matches = glob.glob(os.path.join(target, "*.txt"))
+        else:
+            matches = glob.glob(target, recursive=True)
+        for path in sorted(matches):
+            # Skip our own outputs so rerunning a batch doesn't compile the compiled files
+            if os.path.isfile(path) and not os.path.basename(path).startswith("compiled_"):
+                files.append(path)
+    return list(dict.fromkeys(files))
+
+def positive_int(value):
+    # argparse type for counts of workers, jobs and the like
+    import argparse
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a whole number")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+def run_batch(argv):
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+    parser = argparse.ArgumentParser(prog="review_generator.py batch",
+                                     description="Compile a directory or glob of review files without any prompts.")
+    parser.add_argument("targets", nargs="+", help="review files, directories or glob patterns (e.g. 'archive/**/*.txt')")
+    parser.add_argument("-o", "--output-dir", help="write outputs here instead of next to each input")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    files = collect_review_files(args.targets)
+    if not files:
+        print("❌ No review files found.")
+        return 1
+    try:
+        plan = plan_compiled_outputs(files, args.output_dir)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    jobs = list(plan.items())
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        # Hand out work in chunks, a single review compiles much faster than a pickling round trip
+        chunksize = max(1, len(jobs) // ((args.jobs or os.cpu_count() or 1) * 4))
+        for filename, error in pool.map(_compile_review_job, jobs, chunksize=chunksize):
+            if error:
+                failed += 1
+                print(f"❌ {filename}: {error}")
+
+    print(f"✅ Compiled {len(files) - failed}/{len(files)} reviews.")
+    return 1 if failed else 0
+
+#end of batch functions
+
+
+#watch functions
+def split_section_blocks(text):
+    # Raw text of each section (header line included), cut at the same lines iter_sections uses
+    blocks = []
+    current = None
+    for line in io.StringIO(text):
+        if line.rstrip().startswith("### "):
+            if current is not None:
+                blocks.append("".join(current))
+            current = [line]
+        elif current is not None:
+            current.append(line)
+    if current is not None:
+        blocks.append("".join(current))
+    return blocks
+
+def parse_sections_incremental(text, previous=None):
+    # `previous` maps a section's raw text to its parsed (name, content) from the last run,
+    # only sections whose text changed since then are parsed again.
+    # Returns (sections, cache for the next call, number of sections parsed).
+    previous = previous or {}
+    parsed = {}
+    sections = {}
+    reparsed = 0
+    for block in split_section_blocks(text):
+        entry = parsed.get(block) or previous.get(block)
+        if entry is None:
+            entry = next(iter_sections(io.StringIO(block)))
+            reparsed += 1
+        parsed[block] = entry
+        sections[entry[0]] = entry[1]
+    return sections, parsed, reparsed
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+def _open_inotify(filename):
+    import ctypes
+    import ctypes.util
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    fd = libc.inotify_init1(os.O_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    # Watch the folder, editors often save by writing a new file and renaming it over the old one.
+    # Only finished writes count, a file that was just created may still be half written.
+    directory = os.path.dirname(os.path.abspath(filename))
+    if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        error = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(error, f"inotify_add_watch failed for {directory}")
+    return fd
+
+def _inotify_changes(fd, filename):
+    name = os.fsencode(os.path.basename(filename))
+    try:
+        while True:
+            data = os.read(fd, 64 * 1024)
+            changed = False
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                if data[offset:offset + length].rstrip(b"\0") == name:
+                    changed = True
+                offset += length
+            if changed:
+                yield
+    finally:
+        os.close(fd)
+
+def _poll_changes(filename, interval):
+    def stamp():
+        try:
+            st = os.stat(filename)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def changes(last):
+        while True:
+            time.sleep(interval)
+            current = stamp()
+            if current is not None and current != last:
+                yield
+            last = current
+    # Compared to the file as it is now, not when the first change is asked for
+    return changes(stamp())
+
+def file_changes(filename, interval=0.1):
+    # Yields once per save: inotify on Linux, checking the modification time everywhere else.
+    # Saves are tracked from the moment this returns, even before the first one is asked for.
+    import platform
+    if platform.system() == "Linux":
+        try:
+            return _inotify_changes(_open_inotify(filename), filename)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({e}), checking for changes every {interval}s instead.")
+    return _poll_changes(filename, interval)
+
+def watch_review(filename, interval=0.1, open_editor=True):
+    import threading
+    if filename == "review.txt":
+        ensure_review_exists()
+    bbcode_path, text_path = compiled_output_paths(filename)
+    cache = {}
+    last_outputs = None
+
+    def recompile():
+        nonlocal cache, last_outputs
+        started = time.perf_counter()
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return
+        sections, cache, reparsed = parse_sections_incremental(text, cache)
+        outputs = generate_review_outputs(sections)
+        if outputs == last_outputs:
+            return
+        write_atomic(bbcode_path, outputs[0])
+        write_atomic(text_path, outputs[1])
+        last_outputs = outputs
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🔄 Recompiled in {elapsed:.1f} ms ({reparsed} of {len(cache)} sections changed).")
+
+    # Watch first, so a save made while the first compile runs isn't missed
+    changes = file_changes(filename, interval)
+    recompile()
+    if open_editor:
+        # Some editors return right away, so the watch doesn't depend on when (or if) the editor exits
+        threading.Thread(target=open_editor_and_wait, args=(filename,), daemon=True).start()
+    print(f"Watching {filename} for changes, press Ctrl+C to stop.")
+    try:
+        for _ in changes:
+            try:
+                recompile()
+            except Exception as e:
+                print(f"❌ ERROR: {e}")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def run_watch(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="review_generator.py watch",
+                                     description="Recompile the review every time it is saved.")
+    parser.add_argument("filename", nargs="?", default="review.txt")
+    parser.add_argument("--interval", type=float, default=0.1,
+                        help="seconds between checks when inotify isn't available (default: 0.1)")
+    parser.add_argument("--no-editor", action="store_true", help="don't open the review in an editor")
+    args = parser.parse_args(argv)
+    watch_review(args.filename, args.interval, not args.no_editor)
+    return 0
+
+#end of watch functions
+
+
+def parse_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="review_generator.py",
+                                     description="Write a review in your editor and copy it as BBCode. "
+                                                 "Also: review_generator.py batch|watch --help")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace (JSON) of every phase of the run to FILE")
+    parser.add_argument("--profile", metavar="FILE", help="run under cProfile and save the stats to FILE")
+    parser.add_argument("--store", nargs="?", const="", metavar="FILE",
+                        help="also keep the review in a searchable SQLite store (default: reviews.sqlite, see review_store.py)")
+    add_output_arguments(parser)
+    return parser.parse_args(argv)
+
+def add_output_arguments(parser):
+    import argparse
+
+    def sinks(spec):
+        try:
+            return parse_sinks(spec)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+    parser.add_argument("--output", type=sinks, default=DEFAULT_SINKS, metavar="SINKS",
+                        help=f"comma separated places for the compiled review, written at the same time: "
+                             f"{', '.join(OUTPUT_SINKS)} (default: {','.join(DEFAULT_SINKS)}); archive keeps gzipped copies in {ARCHIVE_DIR}/")
+
+def run_interactive(store=None, sinks=DEFAULT_SINKS):
+    # The old outputs stay until the new ones are renamed over them, nothing is deleted up front
+    with span("ensure review exists"):
+        ensure_review_exists()
+    with span("editor"):
+        open_editor_and_wait("review.txt")
+
+    try:
+        with span("parse"):
+            sections = parse_sections("review.txt")
+        with span("render"):
+            compiled_bbcode, compiled_text = generate_review_outputs(sections)
+
+        with span("write outputs"):
+            deliver_review_outputs(compiled_bbcode, compiled_text, sinks)
+        if store is not None:
+            with span("store"):
+                from review_store import store_compiled_review
+                store_compiled_review(sections, compiled_bbcode, compiled_text, "review.txt", store)
+
+        if "file" in sinks:
+            with span("open output"):
+                open_output_in_editor()
 
     except Exception as e:
         print(f"❌ ERROR: {e}")
@@ -232,3 +814,12 @@ if __name__ == "__main__":
         choice = input("Press [Enter] to reset review.txt, or [Ctrl+C] to cancel: ")
         print("Restoring review to default state...")
         generate_default_review()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(run_batch(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "watch":
+        sys.exit(run_watch(sys.argv[2:]))
+    args = parse_args(sys.argv[1:])
+    run_instrumented(lambda: run_interactive(args.store, args.output), args.trace, args.profile)
@@ -1,85 +1,718 @@
-import ctypes
-import win32clipboard
 import os
-import subprocess
-import platform
-import pyperclip
-from groq import Groq
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from contextlib import closing
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from ai_scheduler import RequestScheduler
+from ai_backends import AI_BACKENDS, create_ai_client
+from ai_policy import AuditLog, PolicyError, check_enhancement, default_section_policy, load_policy
+from tracing import span, run_instrumented
+from review_generator import (ensure_review_exists, generate_default_review, open_editor_and_wait,
+                              open_output_in_editor, parse_sections, generate_review_outputs, collect_review_files,
+                              compiled_output_paths, plan_compiled_outputs, write_atomic, add_output_arguments, deliver_review_outputs,
+                              positive_int)
 #ai functions
+# Successful token checks are remembered here (only a hash of the token is stored)
+TOKEN_CACHE_FILE = ".token_cache.json"
+TOKEN_CACHE_TTL = 24 * 60 * 60
+
+_ai_clients = {}
+_ai_clients_lock = threading.Lock()
+
+def get_ai_client(api_key, backend="groq", base_url=None):
+    # One client per token and backend for the whole process, so HTTP connections are kept alive and reused
+    key = (backend, base_url, api_key)
+    with _ai_clients_lock:
+        client = _ai_clients.get(key)
+        if client is None:
+            client = _ai_clients[key] = create_ai_client(backend, api_key, base_url)
+        return client
+
+def _token_hash(token, backend="groq", base_url=None):
+    # A token is only known to be valid for the API it was checked against
+    return hashlib.sha256(json.dumps([backend, base_url, token]).encode("utf-8")).hexdigest()
+
+def _load_token_cache():
+    try:
+        with open(TOKEN_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def is_token_recently_validated(token, backend="groq", base_url=None):
+    validated_at = _load_token_cache().get(_token_hash(token, backend, base_url))
+    return isinstance(validated_at, (int, float)) and time.time() - validated_at < TOKEN_CACHE_TTL
+
+def remember_valid_token(token, backend="groq", base_url=None):
+    now = time.time()
+    cache = {key: value for key, value in _load_token_cache().items()
+             if isinstance(value, (int, float)) and now - value < TOKEN_CACHE_TTL}
+    cache[_token_hash(token, backend, base_url)] = now
+    try:
+        with open(TOKEN_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"⚠️ Could not save token check: {e}")
+
+AI_MODEL = "llama3-8b-8192"
+AI_SYSTEM_PROMPT = "You are a helpful assistant for writing game reviews."
+AI_TEMPERATURE = 0.7
+AI_MAX_TOKENS = 500
+# Output budget for a bundled request, several sections share one completion
+AI_BUNDLE_MAX_TOKENS = 4000
+# Context window of AI_MODEL, prompt and answer together
+AI_CONTEXT_TOKENS = 8192
+# Longer sections are split on paragraph boundaries into chunks of about this many tokens,
+# small enough that the enhanced chunk still fits in AI_MAX_TOKENS
+AI_CHUNK_TOKENS = 300
+AI_CHUNK_CONCURRENCY = 4
+
+# Enhanced sections are cached on disk, least recently used entries go first once the cache is over size
+AI_CACHE_FILE = ".ai_cache.sqlite"
+AI_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# How many sections are sent to the AI at once, 1 keeps the old one-at-a-time flow
+AI_CONCURRENCY = 1
+
+# With --speculative, a section is sent to the AI once its text hasn't changed for this many seconds
+AI_SPECULATIVE_DEBOUNCE = 3.0
+
+# Default request scheduling, roughly the free-tier limits of AI_MODEL
+AI_REQUESTS_PER_MINUTE = 30
+AI_TOKENS_PER_MINUTE = 6000
+AI_MAX_RETRIES = 5
+
+# concurrency: see AI_CONCURRENCY
+# cache: "use" reads and writes the cache, "refresh" ignores cached answers but stores new ones, "off" bypasses it
+# stream: ask for the completion as a token stream (printed live when sections are processed one at a time)
+# bundle: enhance all non-empty sections with one request returning JSON, falling back per section
+# scheduler: RequestScheduler shared by every call of the run, None uses the process-wide default
+# backend / base_url / model: which API (see ai_backends.AI_BACKENDS), where it is and which model to ask
+# cascade: CascadeTier tuple tried in order for every section instead of `model`, see call_ai_cascade
+AIOptions = namedtuple("AIOptions", ["concurrency", "cache", "stream", "bundle", "scheduler", "backend", "base_url", "model",
+                                     "cascade"],
+                       defaults=[AI_CONCURRENCY, "use", False, False, None, "groq", None, AI_MODEL, None])
+
+_default_ai_scheduler = None
+_default_ai_scheduler_lock = threading.Lock()
+
+def get_ai_scheduler(options):
+    global _default_ai_scheduler
+    if options.scheduler:
+        return options.scheduler
+    with _default_ai_scheduler_lock:
+        if _default_ai_scheduler is None:
+            _default_ai_scheduler = RequestScheduler(AI_REQUESTS_PER_MINUTE, AI_TOKENS_PER_MINUTE, AI_MAX_RETRIES)
+        return _default_ai_scheduler
+
+# One entry per AI call: section, model, streamed, time to first token, total latency, tokens, tokens/sec
+ai_call_metrics = []
+_ai_call_metrics_lock = threading.Lock()
+
+def record_ai_call(section, streamed, ttft, latency, tokens, model=AI_MODEL):
+    with _ai_call_metrics_lock:
+        ai_call_metrics.append({
+            "section": section,
+            "model": model,
+            "streamed": streamed,
+            "ttft": ttft,
+            "latency": latency,
+            "tokens": tokens,
+            "tokens_per_sec": tokens / latency if latency > 0 else 0.0,
+        })
+
+def report_ai_call_metrics(metrics_file=None):
+    if not ai_call_metrics:
+        return
+    print("\nAI call timings:")
+    for m in ai_call_metrics:
+        print(f"  {m['section'] or '-':<10} first token {m['ttft']:.2f}s, total {m['latency']:.2f}s, "
+              f"{m['tokens']} tokens ({m['tokens_per_sec']:.1f}/s)")
+    if metrics_file:
+        # One JSON object per line so runs against different models/backends can be appended and compared
+        with open(metrics_file, "a", encoding="utf-8") as f:
+            for m in ai_call_metrics:
+                f.write(json.dumps(m) + "\n")
+
+ai_cache_stats = {"hits": 0, "misses": 0}
+_ai_cache_stats_lock = threading.Lock()
+
+def _count_ai_cache(stat):
+    with _ai_cache_stats_lock:
+        ai_cache_stats[stat] += 1
+
+def ai_cache_key(backend, base_url, model, system_prompt, prompt, temperature, max_tokens):
+    # The same model name on another backend or server is not the same model
+    payload = json.dumps([backend, base_url, model, system_prompt, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def prompt_cache_key(prompt, options, max_tokens):
+    return ai_cache_key(options.backend, options.base_url, options.model, AI_SYSTEM_PROMPT, prompt, AI_TEMPERATURE, max_tokens)
+
+def _open_ai_cache():
+    import sqlite3
+    conn = sqlite3.connect(AI_CACHE_FILE, timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS ai_cache ("
+                 "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+    return conn
+
+def ai_cache_get(key):
+    import sqlite3
+    try:
+        with closing(_open_ai_cache()) as conn, conn:
+            row = conn.execute("SELECT response FROM ai_cache WHERE key = ?", (key,)).fetchone()
+            if row:
+                conn.execute("UPDATE ai_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                return row[0]
+    except sqlite3.Error as e:
+        print(f"⚠️ AI cache unavailable: {e}")
+    return None
+
+def ai_cache_put(key, response):
+    import sqlite3
+    try:
+        with closing(_open_ai_cache()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO ai_cache (key, response, size, last_used) VALUES (?, ?, ?, ?)",
+                         (key, response, len(response.encode("utf-8")), time.time()))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM ai_cache").fetchone()[0]
+            if total > AI_CACHE_MAX_BYTES:
+                for old_key, size in conn.execute("SELECT key, size FROM ai_cache ORDER BY last_used").fetchall():
+                    conn.execute("DELETE FROM ai_cache WHERE key = ?", (old_key,))
+                    total -= size
+                    if total <= AI_CACHE_MAX_BYTES:
+                        break
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not save AI result to cache: {e}")
+
+def report_ai_cache_stats():
+    print(f"AI cache: {ai_cache_stats['hits']} hits, {ai_cache_stats['misses']} misses.")
+
+# Read token.txt and make sure the token works, returns the token or None
+def load_ai_token(token_file="token.txt", options=None):
+    options = options or AIOptions()
+    if not os.path.exists(token_file):
+        print(f"❌ Error: {token_file} not found.")
+        return None
+
+    with open(token_file, "r", encoding="utf-8") as f:
+        token = f.read().strip()
+
+    if not token:
+        print("❌ Error: Token is blank. Feature disabled.")
+        return None
+
+    if is_token_recently_validated(token, options.backend, options.base_url):
+        print("✅ Token valid (checked recently). AI feature enabled.")
+        return token
+
+    try:
+        get_ai_client(token, options.backend, options.base_url).models.list()  # Basic test call to validate token
+        remember_valid_token(token, options.backend, options.base_url)
+        print("✅ Token valid. AI feature enabled.")
+        return token
+    except Exception as e:
+        print(f"❌ Error validating token: {e}")
+        return None
+
 # Prompt for AI usage and validate Groq token
-def check_ai_usage():
+def check_ai_usage(options=None):
     print("This script uses a Groq API token runs on the LLaMA via Groq's backend. Visit https://console.groq.com/ to generate your token, and paste it into 'token.txt'.")
     print("Note: Avoid using explicit or overly suggestive language. The model may refuse to respond to such content.")
     print("this will not tries to enhance pros and cons part.")
     use_ai = input("Do you want to use AI? (yes/no): ").strip().lower()
     if use_ai == "yes":
-        if not os.path.exists("token.txt"):
-            print("❌ Error: token.txt not found.")
-            return None
-
-        with open("token.txt", "r", encoding="utf-8") as f:
-            token = f.read().strip()
-
-        if not token:
-            print("❌ Error: Token is blank. Feature disabled.")
-            return None
-
-        try:
-            client = Groq(api_key=token)
-            client.models.list()  # Basic test call to validate token
-            print("✅ Token valid. AI feature enabled.")
-            return token
-        except Exception as e:
-            print(f"❌ Error validating token: {e}")
-            return None
+        return load_ai_token(options=options)
     else:
         print("AI feature disabled.")
         return None
 
 
 # Use Groq to call LLaMA 3 and generate text
-def call_ai_to_generate_content(prompt, api_key):
+def _usage_total(holder):
+    # Groq reports usage on the response, or on the last stream chunk under x_groq
+    usage = getattr(holder, "usage", None) or getattr(getattr(holder, "x_groq", None), "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+class StreamInterruptedError(Exception):
+    # Not retried by the scheduler: the start of the answer has already been shown
+    pass
+
+def _read_ai_stream(stream, on_token, started):
+    # Returns (text, time to first token, chunks with content, total tokens if reported);
+    # each content chunk is one token on Groq
+    parts = []
+    ttft = None
+    total_tokens = None
+    try:
+        for chunk in stream:
+            total_tokens = _usage_total(chunk) or total_tokens
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content
+            if token:
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                parts.append(token)
+                if on_token:
+                    on_token(token)
+    except Exception as e:
+        if parts and on_token:
+            raise StreamInterruptedError(f"the answer broke off after {len(parts)} token(s): {e}") from e
+        raise
+    return "".join(parts), ttft, len(parts), total_tokens
+
+# on_token is called with every piece of text as it arrives (or once with a cached answer)
+# json_mode asks the model for a single JSON object (the prompt has to mention JSON)
+# cache_answer=False leaves storing the answer to the caller, e.g. once it is known to parse
+def call_ai_to_generate_content(prompt, api_key, options=None, section=None, on_token=None,
+                                max_tokens=AI_MAX_TOKENS, json_mode=False, cache_answer=True):
+    options = options or AIOptions()
+    cache_key = None
+    if options.cache != "off":
+        cache_key = prompt_cache_key(prompt, options, max_tokens)
+        if options.cache == "use":
+            cached = ai_cache_get(cache_key)
+            if cached is not None:
+                _count_ai_cache("hits")
+                if on_token:
+                    on_token(cached)
+                return cached
+        _count_ai_cache("misses")
+
+    def send():
+        # One attempt, the scheduler decides when it may run and whether to try again
+        with span("ai request", section=section, stream=options.stream) as request_span:
+            started = time.perf_counter()
+            response = get_ai_client(api_key, options.backend, options.base_url).chat.completions.create(
+                model=options.model,
+                messages=[
+                    {"role": "system", "content": AI_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=AI_TEMPERATURE,
+                max_tokens=max_tokens,
+                stream=options.stream,
+                **({"response_format": {"type": "json_object"}} if json_mode else {})
+            )
+            if options.stream:
+                text, ttft, tokens, total_tokens = _read_ai_stream(response, on_token, started)
+                text = text.strip()
+            else:
+                text = response.choices[0].message.content.strip()
+                ttft = None
+                usage = getattr(response, "usage", None)
+                tokens = getattr(usage, "completion_tokens", None) or len(text.split())
+                total_tokens = _usage_total(response)
+                if on_token:
+                    on_token(text)
+            latency = time.perf_counter() - started
+            record_ai_call(section, options.stream, ttft if ttft is not None else latency, latency, tokens, options.model)
+            request_span.set(tokens=total_tokens)
+            return text, total_tokens
+
     try:
-        client = Groq(api_key=api_key)
-        response = client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant for writing game reviews."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500
-        )
-        return response.choices[0].message.content.strip()
+        # Rate limits count the prompt and the whole answer budget
+        estimated_tokens = estimate_tokens(AI_SYSTEM_PROMPT) + estimate_tokens(prompt) + max_tokens
+        # Includes waiting on rate limits and every retry, "ai request" spans are the attempts themselves
+        with span("ai call", section=section):
+            result = get_ai_scheduler(options).run(send, estimated_tokens)
 
     except Exception as e:
         print(f"❌ Error calling AI: {e}")
         return None
 
+    if cache_key and result and cache_answer:
+        ai_cache_put(cache_key, result)
+    return result
+
+AI_SECTION_INSTRUCTIONS = {
+    "main": "Enhance the introduction of the game review. Add more details, but do not add introductory phrases or rewrite the whole section. Only expand on the existing text:",
+    "gameplay": "Enhance the description of the gameplay mechanics. Add more details, but do not add introductory phrases or rewrite the whole section. Only expand on the existing text:",
+    "combat": "Add more detail to the combat system description, without writing a full section. Avoid any introductory sentences like 'Let’s dive into combat.' Only enhance the current description:",
+    "art": "Expand on the description of the game's art style, without any introduction. Simply add more relevant detail to the existing description:",
+    "story": "Enhance the description of the game’s story without adding any introductory text like 'Here’s the story breakdown'. Focus solely on improving the original description:",
+    "tldr": "Write a concise TL;DR summary. Avoid any introductory sentences and just summarize the review:"
+}
+
+def build_section_prompt(key, text):
+    return f"{AI_SECTION_INSTRUCTIONS[key]} {text}"
+
+def build_ai_prompts(sections):
+    return {key: build_section_prompt(key, sections.get(key, '')) for key in AI_SECTION_INSTRUCTIONS}
+
+
+def estimate_tokens(text):
+    # Roughly 4 characters per token for English text, close enough to plan context use without a tokenizer
+    return (len(text) + 3) // 4
+
+def split_into_chunks(text, max_tokens=AI_CHUNK_TOKENS, separators=("\n\n", "\n", ". ", " ")):
+    # Packs paragraphs into chunks of at most max_tokens, only breaking a paragraph into
+    # lines, then sentences, then words when it doesn't fit on its own.
+    # Returns (chunk, joiner) pairs, joiner being what separated the chunk from the next one ("" after the last);
+    # a sentence keeps its "." and only the space becomes the joiner
+    text = text.strip()
+    if estimate_tokens(text) <= max_tokens or not separators:
+        return [(text, "")] if text else []
+    separator, finer = separators[0], separators[1:]
+    kept = separator.rstrip()
+    joiner = separator[len(kept):]
+    parts = text.split(separator)
+    pieces = []
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        part_pieces = split_into_chunks(part if last else part + kept, max_tokens, finer)
+        if part_pieces and not last:
+            part_pieces[-1] = (part_pieces[-1][0], joiner)
+        pieces.extend(part_pieces)
+    chunks, current, current_joiner = [], "", ""
+    for piece, piece_joiner in pieces:
+        candidate = f"{current}{current_joiner}{piece}" if current else piece
+        if current and estimate_tokens(candidate) > max_tokens:
+            chunks.append((current, current_joiner))
+            current = piece
+        else:
+            current = candidate
+        current_joiner = piece_joiner
+    if current:
+        chunks.append((current, ""))
+    return chunks
+
+def section_chunks(text):
+    return [(text, "")] if estimate_tokens(text) <= AI_CHUNK_TOKENS else split_into_chunks(text)
+
+
+#cascade functions
+# A model cascade goes from the fastest model to the largest, e.g. --cascade llama-3.1-8b-instant:200,llama-3.3-70b-versatile
+# max_tokens: the tier is only tried for texts up to this many (estimated) tokens, None for any size,
+# so short sections like the TL;DR start on the fast model and long ones go straight to a larger one
+CascadeTier = namedtuple("CascadeTier", ["model", "max_tokens"], defaults=[None])
+
+def parse_cascade(spec):
+    tiers = []
+    for entry in spec.split(","):
+        model, _, limit = entry.strip().partition(":")
+        if not model:
+            raise ValueError(f"empty model in cascade '{spec}'")
+        try:
+            tiers.append(CascadeTier(model, int(limit) if limit else None))
+        except ValueError:
+            raise ValueError(f"cascade limit for {model} must be a number of tokens, not '{limit}'")
+    return tuple(tiers)
+
+# Per model: calls, answers that passed the checks, calls that escalated to the next tier, total seconds
+ai_cascade_stats = {}
+_ai_cascade_stats_lock = threading.Lock()
+
+def _record_cascade_tier(model, latency, passed, escalated):
+    with _ai_cascade_stats_lock:
+        stats = ai_cascade_stats.setdefault(model, {"calls": 0, "passed": 0, "escalated": 0, "latency": 0.0})
+        stats["calls"] += 1
+        stats["passed"] += passed
+        stats["escalated"] += escalated
+        stats["latency"] += latency
+
+def report_ai_cascade_stats():
+    if not ai_cascade_stats:
+        return
+    print("\nAI cascade:")
+    for model, stats in ai_cascade_stats.items():
+        calls = stats["calls"]
+        print(f"  {model:<28} {calls} call(s), avg {stats['latency'] / calls:.2f}s, "
+              f"{stats['passed'] / calls:.0%} passed, {stats['escalated'] / calls:.0%} escalated")
+
+def call_ai_cascade(key, text, api_key, options, on_token=None):
+    # Asks the cascade's models in turn until an answer passes the local checks; the last model's answer
+    # is returned even when it fails them. Only the last tier streams, earlier answers are shown once they pass.
+    prompt = build_section_prompt(key, text)
+    if not options.cascade:
+        return call_ai_to_generate_content(prompt, api_key, options, key, on_token)
+    size = estimate_tokens(text)
+    tiers = [tier for tier in options.cascade if tier.max_tokens is None or size <= tier.max_tokens] or options.cascade[-1:]
+    gate = default_section_policy(key)  # cheap local checks an answer must pass before the cascade stops
+    result = None
+    for index, tier in enumerate(tiers):
+        last = index == len(tiers) - 1
+        started = time.perf_counter()
+        with span("ai cascade tier", section=key, model=tier.model) as tier_span:
+            result = call_ai_to_generate_content(prompt, api_key,
+                                                 options._replace(model=tier.model, stream=options.stream and last),
+                                                 key, on_token if last else None)
+            passed, reason = check_enhancement(text, result, gate)
+            tier_span.set(passed=passed)
+        _record_cascade_tier(tier.model, time.perf_counter() - started, passed, not passed and not last)
+        if passed:
+            if on_token and not last:
+                on_token(result)
+            return result
+        if not last:
+            print(f"⚠️ {tier.model}'s answer for '{key}' {reason}, asking {tiers[index + 1].model}...")
+    return result
+#end of cascade functions
+
+
+def enhance_section(key, text, api_key, options, on_token=None):
+    chunks = section_chunks(text)
+    if len(chunks) <= 1:
+        return call_ai_cascade(key, text, api_key, options, on_token)
+
+    # Map: enhance every chunk on its own and in parallel. Reduce: stitch the results back in order.
+    print(f"The '{key}' section is long, enhancing it in {len(chunks)} parts...")
+    with ThreadPoolExecutor(max_workers=min(len(chunks), AI_CHUNK_CONCURRENCY)) as pool:
+        results = list(pool.map(
+            lambda chunk: call_ai_cascade(key, chunk[0], api_key, options),
+            chunks))
+    if not all(results):
+        return None
+    # Stitched back with whatever separated the chunks in the original: a paragraph break, a line break or a space
+    return "".join(result.strip() + joiner for result, (_, joiner) in zip(results, chunks))
+
+
+def plan_ai_calls(sections, options):
+    # What process_with_ai would send for these sections, without sending anything
+    system_tokens = estimate_tokens(AI_SYSTEM_PROMPT)
+    plan = []
+    for key in AI_SECTION_INSTRUCTIONS:
+        text = sections.get(key, "")
+        if not text.strip():
+            continue
+        chunks = section_chunks(text)
+        plan.append({
+            "section": key,
+            "text_tokens": estimate_tokens(text),
+            "calls": len(chunks),
+            "input_tokens": sum(system_tokens + estimate_tokens(build_section_prompt(key, chunk)) for chunk, _ in chunks),
+            "max_output_tokens": len(chunks) * AI_MAX_TOKENS,
+        })
+
+    bundled = [entry for entry in plan if entry["calls"] == 1]
+    if options.bundle and len(bundled) > 1:
+        bundled_prompt = build_bundled_prompt({entry["section"]: build_section_prompt(entry["section"], sections[entry["section"]])
+                                               for entry in bundled})
+        plan = [entry for entry in plan if entry["calls"] > 1]
+        plan.insert(0, {
+            "section": "+".join(entry["section"] for entry in bundled),
+            "text_tokens": sum(entry["text_tokens"] for entry in bundled),
+            "calls": 1,
+            "input_tokens": system_tokens + estimate_tokens(bundled_prompt),
+            "max_output_tokens": min(AI_MAX_TOKENS * len(bundled), AI_BUNDLE_MAX_TOKENS),
+        })
+    return plan
+
+def report_ai_plan(plan):
+    print("\nAI dry run, nothing is sent:")
+    for entry in plan:
+        per_call = (entry["input_tokens"] + entry["max_output_tokens"]) // entry["calls"]
+        warning = " ⚠️ over the model's context" if per_call > AI_CONTEXT_TOKENS else ""
+        print(f"  {entry['section']:<10} ~{entry['text_tokens']} text tokens, {entry['calls']} call(s), "
+              f"~{entry['input_tokens']} input + up to {entry['max_output_tokens']} output tokens{warning}")
+    print(f"Total: {sum(entry['calls'] for entry in plan)} call(s), "
+          f"~{sum(entry['input_tokens'] for entry in plan)} input tokens, "
+          f"up to {sum(entry['max_output_tokens'] for entry in plan)} output tokens.")
+
+def build_bundled_prompt(prompts):
+    lines = [
+        "Improve several sections of one game review. Each section below comes with its own instructions.",
+        "Reply with a single JSON object. Its keys must be exactly the section names below, and each value "
+        "must be the improved text of that section as a plain string. Do not add any other keys or text.",
+    ]
+    for key, prompt in prompts.items():
+        lines.append(f"\nSection \"{key}\":\n{prompt}")
+    return "\n".join(lines)
+
+def parse_bundled_response(text, keys):
+    # Keeps only the sections that came back as non-empty strings, the rest are redone one by one
+    if not text:
+        return {}
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        data = json.loads(text[start:end + 1]) if start != -1 else None
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return {}
+    return {key: data[key].strip() for key in keys
+            if isinstance(data.get(key), str) and data[key].strip()}
+
+def call_ai_bundled(prompts, api_key, options):
+    bundled_prompt = build_bundled_prompt(prompts)
+    max_tokens = min(AI_MAX_TOKENS * len(prompts), AI_BUNDLE_MAX_TOKENS)
+    # JSON is only useful once complete, so the bundled request is never streamed
+    options = options._replace(stream=False)
+    text = call_ai_to_generate_content(bundled_prompt, api_key, options, "bundle",
+                                       max_tokens=max_tokens, json_mode=True, cache_answer=False)
+    results = parse_bundled_response(text, prompts)
+    # A reply that isn't usable JSON is not cached, or every later run would get the same broken answer
+    if results and options.cache != "off":
+        ai_cache_put(prompt_cache_key(bundled_prompt, options, max_tokens), text)
+    return results
+
+
+def start_ai_requests(texts, api_key, options):
+    # Fire every section in the background, results are picked up later through the returned futures
+    pool = ThreadPoolExecutor(max_workers=options.concurrency)
+    futures = {key: pool.submit(enhance_section, key, text, api_key, options) for key, text in texts.items()}
+    return pool, futures
+
+
+def enhance_sections(sections, api_key, options, keys=None):
+    # Non-interactive: enhance the chosen (default: all non-empty) sections at once and return
+    # {section: enhanced text or None}, nothing in `sections` is changed
+    texts = {key: sections[key] for key in (AI_SECTION_INSTRUCTIONS if keys is None else keys)
+             if key in AI_SECTION_INSTRUCTIONS and isinstance(sections.get(key), str) and sections[key].strip()}
+    results = {}
+    if options.bundle:
+        bundleable = {key: build_section_prompt(key, text) for key, text in texts.items() if len(section_chunks(text)) == 1}
+        if len(bundleable) > 1:
+            results = call_ai_bundled(bundleable, api_key, options)
+    remaining = {key: text for key, text in texts.items() if key not in results}
+    if remaining:
+        with ThreadPoolExecutor(max_workers=max(1, min(options.concurrency, len(remaining)))) as pool:
+            futures = {key: pool.submit(enhance_section, key, text, api_key, options) for key, text in remaining.items()}
+            results.update({key: future.result() for key, future in futures.items()})
+    return {key: results.get(key) for key in texts}
+
+
+class SpeculativeEnhancer:
+    # Watches the review while it is still being edited and starts enhancing every section whose text
+    # has been stable for `debounce` seconds. A job is cancelled (or its result dropped) when the text changes again.
+    # Sections still reading as they did when the editor opened (last review, template placeholders) are left
+    # alone: that text is most likely about to be replaced.
+    def __init__(self, filename, api_key, options, debounce=AI_SPECULATIVE_DEBOUNCE, poll_interval=0.2):
+        self.filename = filename
+        self.api_key = api_key
+        self.options = options
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.pool = ThreadPoolExecutor(max_workers=max(2, options.concurrency))
+        self.jobs = {}  # section -> (text that was sent, future)
+        self.seen = {}  # section -> (text, when it last changed)
+        self.initial = None  # section -> text when watching started
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        last_stamp = None
+        sections = None
+        while not self.stopped.wait(self.poll_interval):
+            try:
+                st = os.stat(self.filename)
+                stamp = (st.st_mtime_ns, st.st_size)
+                if stamp != last_stamp:
+                    sections = parse_sections(self.filename)
+                    last_stamp = stamp
+            except (OSError, ValueError):
+                continue
+            self._update(sections, time.monotonic())
+
+    def _update(self, sections, now):
+        with self.lock:
+            if self.initial is None:
+                self.initial = {key: sections.get(key, "") for key in AI_SECTION_INSTRUCTIONS}
+            for key in AI_SECTION_INSTRUCTIONS:
+                text = sections.get(key, "")
+                seen = self.seen.get(key)
+                if seen is None or seen[0] != text:
+                    self.seen[key] = (text, now)
+                    job = self.jobs.pop(key, None)
+                    if job:
+                        job[1].cancel()
+                elif (text.strip() and text != self.initial[key] and key not in self.jobs
+                      and now - seen[1] >= self.debounce):
+                    self.jobs[key] = (text, self.pool.submit(enhance_section, key, text, self.api_key, self.options))
+
+    def stop_watching(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def results_for(self, sections):
+        # Background jobs that enhanced exactly the final text of their section
+        with self.lock:
+            return {key: future for key, (text, future) in self.jobs.items()
+                    if sections.get(key) == text and not future.cancelled()}
+
+    def shutdown(self):
+        self.stop_watching()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
 
 # Ask user if they want AI enhancement per section
-def process_with_ai(sections, api_key):
+# prefetched: {section: future} already running for the current text, e.g. from SpeculativeEnhancer
+def process_with_ai(sections, api_key, options=None, prefetched=None):
+    options = options or AIOptions()
+    prefetched = prefetched or {}
+    if prefetched:
+        print(f"{len(prefetched)} section(s) were already sent to the AI while you were writing.")
+
+    eligible = {key: sections[key] for key in AI_SECTION_INSTRUCTIONS
+                if sections.get(key, "").strip() and key not in prefetched}
+
+    ready = {}
+    # Long sections are chunked and can't share a single JSON answer, they always go on their own
+    bundleable = {key: build_section_prompt(key, text) for key, text in eligible.items() if len(section_chunks(text)) == 1}
+    if options.bundle and len(bundleable) > 1:
+        print(f"Sending {len(bundleable)} sections to the AI in one request...")
+        ready = call_ai_bundled(bundleable, api_key, options)
+        missing = [key for key in bundleable if key not in ready]
+        if missing:
+            print(f"⚠️ No usable answer for {', '.join(missing)} in the combined reply, asking for those separately.")
+        eligible = {key: text for key, text in eligible.items() if key not in ready}
+
+    pool, pending = None, {}
+    if options.concurrency > 1 and eligible:
+        print(f"Sending {len(eligible)} sections to the AI in the background...")
+        pool, pending = start_ai_requests(eligible, api_key, options)
+    pending.update(prefetched)
 
-    prompts = {
-        "main": f"Enhance the introduction of the game review. Add more details, but do not add introductory phrases or rewrite the whole section. Only expand on the existing text: {sections.get('main', '')}",
-        "gameplay": f"Enhance the description of the gameplay mechanics. Add more details, but do not add introductory phrases or rewrite the whole section. Only expand on the existing text: {sections.get('gameplay', '')}",
-        "combat": f"Add more detail to the combat system description, without writing a full section. Avoid any introductory sentences like 'Let’s dive into combat.' Only enhance the current description: {sections.get('combat', '')}",
-        "art": f"Expand on the description of the game's art style, without any introduction. Simply add more relevant detail to the existing description: {sections.get('art', '')}",
-        "story": f"Enhance the description of the game’s story without adding any introductory text like 'Here’s the story breakdown'. Focus solely on improving the original description: {sections.get('story', '')}",
-        "tldr": f"Write a concise TL;DR summary. Avoid any introductory sentences and just summarize the review: {sections.get('tldr', '')}"
-    }
+    try:
+        _review_ai_results(sections, api_key, ready, pending, options)
+    finally:
+        if pool:
+            # Nothing left to wait for once the user is done (or skipped the rest)
+            pool.shutdown(wait=False, cancel_futures=True)
 
 
-    for key, prompt in prompts.items():
+def _review_ai_results(sections, api_key, ready, pending, options):
+    for key in AI_SECTION_INSTRUCTIONS:
         section_content = sections.get(key, "").strip()  # Strip any leading/trailing spaces
         if section_content:  # Only proceed if the section is not blank
             print(f"\n--- Original '{key}' Section ---\n{section_content}")
             use_ai = input(f"\nDo you want to use AI to enhance the '{key}' section? (yes/no/skip): ").strip().lower()
             if use_ai == "yes":
-                print(f"Using AI to process the '{key}' section...")
-                ai_result = call_ai_to_generate_content(prompt, api_key)
+                if key in ready:
+                    ai_result = ready[key]
+                    shown = False
+                elif key in pending:
+                    if not pending[key].done():
+                        print(f"Waiting for the AI to finish the '{key}' section...")
+                    ai_result = pending[key].result()
+                    shown = False
+                else:
+                    print(f"Using AI to process the '{key}' section...")
+                    streamed = []
+                    def show_token(token, key=key, streamed=streamed):
+                        # Show the answer while it is being written instead of after the whole completion
+                        if not streamed:
+                            print(f"\n--- AI-Generated '{key}' Section ---")
+                        streamed.append(token)
+                        print(token, end="", flush=True)
+                    ai_result = enhance_section(key, sections[key], api_key, options,
+                                                on_token=show_token if options.stream else None)
+                    if streamed:
+                        print()
+                    shown = bool(streamed)
                 if ai_result:
-                    print(f"\n--- AI-Generated '{key}' Section ---\n{ai_result}")
+                    if not shown:
+                        print(f"\n--- AI-Generated '{key}' Section ---\n{ai_result}")
                     choice = input("Use the AI-generated version? (yes/no): ").strip().lower()
                     if choice == "yes":
                         sections[key] = ai_result
@@ -97,240 +730,239 @@ def process_with_ai(sections, api_key):
             print(f"Skipping '{key}' section as it's empty.")
 
 
+#unattended functions
+def enhance_review_file(filename, api_key, options, policy, audit, output_dir=None, output_paths=None):
+    # Enhances one review as the policy says, logs every decision and writes the compiled outputs.
+    # Returns (accepted, rejected) section counts.
+    sections = parse_sections(filename)
+    keys = []
+    for key in AI_SECTION_INSTRUCTIONS:
+        if not sections.get(key, "").strip():
+            continue
+        if policy.for_section(key).enhance and policy.allows(key):
+            keys.append(key)
+        else:
+            audit.record(filename, key, "skip", "policy does not enhance this section")
+
+    model = "+".join(tier.model for tier in options.cascade) if options.cascade else options.model
+    accepted = rejected = 0
+    for key, result in enhance_sections(sections, api_key, options, keys).items():
+        ok, reason = check_enhancement(sections[key], result, policy.for_section(key))
+        audit.record(filename, key, "accept" if ok else "reject", reason, sections[key], result, model=model)
+        if ok:
+            sections[key] = result
+            accepted += 1
+        else:
+            rejected += 1
+
+    compiled_bbcode, compiled_text = generate_review_outputs(sections)
+    bbcode_path, text_path = output_paths or compiled_output_paths(filename, output_dir)
+    write_atomic(bbcode_path, compiled_bbcode)
+    write_atomic(text_path, compiled_text)
+    return accepted, rejected
+
+def run_unattended(argv):
+    from concurrent.futures import as_completed
+    parser = argparse.ArgumentParser(prog="review_generator_ai.py auto",
+                                     description="Enhance reviews with AI without any prompts, as a policy decides.")
+    parser.add_argument("targets", nargs="+", help="review files, directories or glob patterns (e.g. 'archive/**/*.txt')")
+    parser.add_argument("--policy", metavar="FILE", help="JSON policy, see ai_policy.py (default: enhance everything, accept what passes the checks)")
+    parser.add_argument("--audit", metavar="FILE", default="ai_audit.jsonl",
+                        help="append every skip/accept/reject decision to FILE as JSON lines (default: ai_audit.jsonl)")
+    parser.add_argument("-o", "--output-dir", help="write outputs here instead of next to each input")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=4, help="reviews enhanced at once (default: 4)")
+    parser.add_argument("-c", "--concurrency", type=positive_int, default=4, help="AI calls at once per review (default: 4)")
+    parser.add_argument("--sections", help="comma separated sections to enhance, on top of the policy")
+    parser.add_argument("--accept", choices=["auto", "always", "never"], help="override the policy's accept mode")
+    parser.add_argument("--min-ratio", type=float, help="override: reject answers shorter than this times the original")
+    parser.add_argument("--max-ratio", type=float, help="override: reject answers longer than this times the original")
+    parser.add_argument("--allow-refusals", action="store_const", const=False, dest="reject_refusals",
+                        help="don't reject answers that look like refusals")
+    parser.add_argument("--allow-intros", action="store_const", const=False, dest="reject_intros",
+                        help="don't reject answers opening with an introductory phrase (\"Here is ...\")")
+    add_ai_arguments(parser)
+    parser.set_defaults(stream=False)
+    args = parser.parse_args(argv)
 
-#end of ai functions
-
-def delete_old_files():
-    for fname in ["compiled_review_bbcode.txt", "compiled_review.txt"]:
-        if os.path.exists(fname):
-            os.remove(fname)
-
-def generate_default_review():
-    with open("review.txt", "w", encoding="utf-8") as f:
-        f.write("""You can close this after you're done writing. Don't forget to save it!
-
-Instructions:
-- You can leave any section blank if you don't wish to include it in the review.
-- If a section is left blank, it will not be included in the final review when generated.
-
-### game
-title
-
-### main
-review
-
-### gameplay
-Gameplay review
+    try:
+        policy = load_policy(args.policy, args.sections and args.sections.split(","), accept=args.accept,
+                             min_ratio=args.min_ratio, max_ratio=args.max_ratio, reject_refusals=args.reject_refusals,
+                             reject_intros=args.reject_intros)
+    except PolicyError as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+    files = collect_review_files(args.targets)
+    if not files:
+        print("❌ No review files found.")
+        return 1
+    try:
+        plan = plan_compiled_outputs(files, args.output_dir)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+    options = ai_options_from_args(args)
+    api_key = load_ai_token(options=options)
+    if not api_key:
+        return 1
+
+    audit = AuditLog(args.audit)
+    totals = {"accepted": 0, "rejected": 0, "failed": 0}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(enhance_review_file, filename, api_key, options, policy, audit, output_paths=paths): filename
+                   for filename, paths in plan.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            filename = futures[future]
+            try:
+                accepted, rejected = future.result()
+            except Exception as e:
+                totals["failed"] += 1
+                audit.record(filename, None, "error", f"{type(e).__name__}: {e}")
+                print(f"[{done}/{len(files)}] ❌ {filename}: {e}")
+                continue
+            totals["accepted"] += accepted
+            totals["rejected"] += rejected
+            print(f"[{done}/{len(files)}] ✅ {filename}: {accepted} accepted, {rejected} rejected")
+
+    print(f"\nEnhanced {len(files) - totals['failed']}/{len(files)} reviews in {time.perf_counter() - started:.1f}s: "
+          f"{totals['accepted']} sections accepted, {totals['rejected']} rejected. Decisions logged to {args.audit}.")
+    if options.cache != "off":
+        report_ai_cache_stats()
+    options.scheduler.report()
+    report_ai_cascade_stats()
+    if args.metrics:
+        report_ai_call_metrics(args.metrics)
+    return 1 if totals["failed"] else 0
+#end of unattended functions
 
-### combat
-combat
+#end of ai functions
 
-### art
-art
 
-### story
-story
+def add_ai_arguments(parser):
+    # Options shared by the interactive and the unattended (auto) mode
+    parser.add_argument("--cache", choices=["use", "refresh", "off"], default="use",
+                        help="reuse earlier AI results for unchanged sections (use), ask again and update them (refresh), or skip the cache (off)")
+    parser.add_argument("--bundle", action="store_true",
+                        help="enhance all non-empty sections with a single AI request (sections it misses are retried one by one)")
+    parser.add_argument("--rpm", type=int, default=AI_REQUESTS_PER_MINUTE,
+                        help=f"AI requests allowed per minute, 0 for no limit (default: {AI_REQUESTS_PER_MINUTE})")
+    parser.add_argument("--tpm", type=int, default=AI_TOKENS_PER_MINUTE,
+                        help=f"AI tokens allowed per minute, 0 for no limit (default: {AI_TOKENS_PER_MINUTE})")
+    parser.add_argument("--max-retries", type=int, default=AI_MAX_RETRIES,
+                        help="retries for rate-limited or failed AI calls, with exponential backoff")
+    parser.add_argument("--token-budget", type=int,
+                        help="stop calling the AI once this run has used this many tokens")
+    parser.add_argument("--cost-budget", type=float,
+                        help="stop calling the AI once this run has cost this many dollars (needs --price-per-mtok)")
+    parser.add_argument("--price-per-mtok", type=float, default=0.0,
+                        help="price per million tokens in dollars, used for --cost-budget and the end-of-run report")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="append per-section AI timings (time to first token, latency, tokens/sec) to FILE as JSON lines")
+    parser.add_argument("--backend", choices=sorted(AI_BACKENDS), default="groq",
+                        help="AI API to use: groq (default) or any OpenAI-compatible server with --base-url")
+    parser.add_argument("--base-url", help="API address, e.g. http://127.0.0.1:8000/v1 for ai_stub_server.py (default: the backend's own)")
+    parser.add_argument("--model", default=AI_MODEL, help=f"model to ask (default: {AI_MODEL})")
+    parser.add_argument("--cascade", metavar="MODELS", type=parse_cascade,
+                        help="comma separated models from fastest to largest, e.g. llama-3.1-8b-instant:200,llama-3.3-70b-versatile; "
+                             "a section goes to the next model only when an answer fails the local checks (refusal, "
+                             "introductory phrase, length), ':N' skips a model for sections over N tokens. Replaces --model")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="review_generator_ai.py",
+                                     description="Write a review in your editor and optionally enhance it with AI. "
+                                                 "For whole directories without prompts: review_generator_ai.py auto --help")
+    parser.add_argument("-c", "--concurrency", type=int, default=AI_CONCURRENCY,
+                        help="send up to N non-empty sections to the AI at once before asking about them (default: 1, one at a time)")
+    parser.add_argument("--speculative", action="store_true",
+                        help="start enhancing sections in the background while you are still editing")
+    parser.add_argument("--debounce", type=float, default=AI_SPECULATIVE_DEBOUNCE,
+                        help=f"with --speculative, seconds a section must stay unchanged before it is sent (default: {AI_SPECULATIVE_DEBOUNCE})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show how many AI calls and tokens each section would need, without sending anything")
+    parser.add_argument("--stream", action="store_true",
+                        help="print AI answers token by token as they arrive")
+    add_ai_arguments(parser)
+    parser.add_argument("--store", nargs="?", const="", metavar="FILE",
+                        help="also keep the (enhanced) review in a searchable SQLite store (default: reviews.sqlite, see review_store.py)")
+    add_output_arguments(parser)
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace (JSON) of every phase and AI call to FILE")
+    parser.add_argument("--profile", metavar="FILE", help="run under cProfile and save the stats to FILE")
+    return parser.parse_args(argv)
+
+
+def ai_options_from_args(args):
+    scheduler = RequestScheduler(args.rpm, args.tpm, args.max_retries, token_budget=args.token_budget,
+                                 cost_budget=args.cost_budget, price_per_million_tokens=args.price_per_mtok)
+    return AIOptions(concurrency=args.concurrency, cache=args.cache, stream=args.stream, bundle=args.bundle,
+                     scheduler=scheduler, backend=args.backend, base_url=args.base_url, model=args.model,
+                     cascade=args.cascade)
+
+
+def run_interactive(args):
+    with span("ensure review exists"):
+        ensure_review_exists()
+    options = ai_options_from_args(args)
+    with span("check ai usage"):
+        api_key = None if args.dry_run else check_ai_usage(options)
+    speculative = None
+    if api_key and args.speculative:
+        speculative = SpeculativeEnhancer("review.txt", api_key, options, args.debounce).start()
+    try:
+        with span("editor"):
+            open_editor_and_wait("review.txt")
+        if speculative:
+            speculative.stop_watching()
 
-### pros
-pros
+        try:
+            with span("parse"):
+                sections = parse_sections("review.txt")
+            if args.dry_run:
+                report_ai_plan(plan_ai_calls(sections, options))
+            elif api_key:
+                print("AI feature is enabled.")
+                prefetched = speculative.results_for(sections) if speculative else None
+                with span("process with ai"):
+                    process_with_ai(sections, api_key, options, prefetched)  # Process the review sections with AI if api_key exists
+                if options.cache != "off":
+                    report_ai_cache_stats()
+                options.scheduler.report()
+                report_ai_cascade_stats()
+                report_ai_call_metrics(args.metrics)
+            else:
+                print("AI feature is not enabled. Proceeding without AI.")
+            if speculative:
+                speculative.shutdown()
 
-### cons
-cons
+            with span("render"):
+                compiled_bbcode, compiled_text = generate_review_outputs(sections)
 
-### tldr
-tldr.
-""")
+            with span("write outputs"):
+                deliver_review_outputs(compiled_bbcode, compiled_text, args.output)
+            if args.store is not None:
+                with span("store"):
+                    from review_store import store_compiled_review
+                    store_compiled_review(sections, compiled_bbcode, compiled_text, "review.txt", args.store)
 
+            if "file" in args.output:
+                with span("open output"):
+                    open_output_in_editor()
 
-def ensure_review_exists():
-    if not os.path.exists("review.txt"):
-        print("review.txt not found. Creating one...")
-        generate_default_review()
-        print("New review.txt generated.\n")
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            print("Something went wrong during execution.")
+            print("Read the error above. If you're not sure what went wrong, press Enter to reset the review.txt to its default format.")
+            choice = input("Press [Enter] to reset review.txt, or [Ctrl+C] to cancel: ")
+            print("Restoring review to default state...")
+            generate_default_review()
+    finally:
+        # Also on errors and Ctrl+C, or the enhancer's threads keep the process alive and keep calling the AI
+        if speculative:
+            speculative.shutdown()
 
-def open_editor_and_wait(filename):
-    system = platform.system()
 
-    if system == "Windows":
-        print("Opening review.txt in Notepad. Close it when you're ready.")
-        subprocess.run(["notepad", filename])
-    elif system == "Linux":
-        # This assumes `gedit` is installed on the Linux system, or you could replace it with `nano`, `vim`, etc.
-        print("Opening review.txt in gedit. Close it when you're ready.")
-        subprocess.run(["gedit", filename])
-    elif system == "Darwin":  # For macOS
-        print("Opening review.txt in TextEdit. Close it when you're ready.")
-        subprocess.run(["open", "-a", "TextEdit", filename])
-    else:
-        print("Unsupported OS. Please edit the file manually and run this again.")
-
-def open_output_in_editor():
-    subprocess.Popen(["notepad", "compiled_review.txt"])
-    
-def build_bbcode_clipboard_fragment(bbcode_fragment):
-    bbcode = f"{bbcode_fragment}"
-    return bbcode.encode("utf-16le")
-
-def copy_bbcode_to_clipboard(bbcode_fragment):
-    # Assuming the fragment is properly encoded in UTF-16LE (if you really need that)
-    bbcode_clipboard = build_bbcode_clipboard_fragment(bbcode_fragment)
-    
-    # Ensure the text is in a format pyperclip can handle (plain string, not raw bytes)
-    # We need to decode it to a Python string if it's in UTF-16LE
-    if isinstance(bbcode_clipboard, bytes):
-        bbcode_clipboard = bbcode_clipboard.decode('utf-16le')
-
-    # Now copy it to the clipboard
-    pyperclip.copy(bbcode_clipboard)
-
-
-def parse_sections(filename):
-    sections = {}
-    current_section = None
-    with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.rstrip()
-            if line.startswith("### "):
-                current_section = line[4:].strip().lower()
-                sections[current_section] = []
-            elif current_section:
-                sections[current_section].append(line)
-    return {
-        key: '\n'.join(value).strip() if key in ['main','gameplay','combat','art','story', 'tldr', 'game'] 
-        else [line.strip() for line in value if line.strip()]
-        for key, value in sections.items()
-    }
-
-def generate_review_bbcode(sections):
-    game_info = sections.get("game", "Unknown Game")
-    yapping = sections.get("main", "")
-    gameplay = sections.get("gameplay", "")
-    combat = sections.get("combat", "")
-    art = sections.get("art", "")
-    story = sections.get("story", "")
-    pros = sections.get("pros", [])
-    cons = sections.get("cons", [])
-    tldr = sections.get("tldr", "")
-
-    # BBCode formatting for the title
-    title_bbcode = f'[B][SIZE=6]{game_info}[/SIZE][/B]\n\n'
-
-    # Main body with newline after each line, check if content exists
-    body_bbcode = '\n'.join([f'{line}' for line in yapping.split('\n') if line.strip()])
-    if body_bbcode:  # Only add newline if body has content
-        body_bbcode += '\n\n'
-    
-    body1_bbcode = '\n'.join([f'{line}' for line in gameplay.split('\n') if line.strip()])
-    if body1_bbcode:  
-        body1_bbcode += '\n\n'
-    
-    body2_bbcode = '\n'.join([f'{line}' for line in combat.split('\n') if line.strip()])
-    if body2_bbcode: 
-        body2_bbcode += '\n\n'
-    
-    body3_bbcode = '\n'.join([f'{line}' for line in art.split('\n') if line.strip()])
-    if body3_bbcode:  
-        body3_bbcode += '\n\n'
-    
-    body4_bbcode = '\n'.join([f'{line}' for line in story.split('\n') if line.strip()])
-    if body4_bbcode:  
-        body4_bbcode += '\n\n'
-
-    pros_bbcode = ''
-    if pros:  
-        pros_bbcode = '[COLOR=rgb(0, 128, 0)][B]Pros[/B][/COLOR]\n'
-        pros_bbcode += '\n'.join([f'[COLOR=rgb(0, 128, 0)] +[/COLOR] {p}' for p in pros]) + '\n\n'
-
-    cons_bbcode = ''
-    if cons:  
-        cons_bbcode = '[COLOR=rgb(184, 49, 47)][B]Cons[/B][/COLOR]\n'
-        cons_bbcode += '\n'.join([f'[COLOR=rgb(184, 49, 47)] -[/COLOR] {c}' for c in cons]) + '\n\n'
-
-    tldr_bbcode = ''
-    if tldr.strip():  
-        tldr_bbcode = '[B][COLOR=rgb(255, 165, 0)]TL;DR:[/COLOR][/B] ' 
-        tldr_bbcode += f'{tldr}\n'
-
-    # Combine everything with appropriate line breaks between sections
-    return title_bbcode + body_bbcode + body1_bbcode + body2_bbcode + body3_bbcode + body4_bbcode + pros_bbcode + cons_bbcode + tldr_bbcode
-
-    
-def generate_review(sections):
-    game_info = sections.get("game", "Unknown Game")
-    yapping = sections.get("main", "")
-    gameplay = sections.get("gameplay", "")
-    combat = sections.get("combat", "")
-    art = sections.get("art", "")
-    story = sections.get("story", "")
-    pros = sections.get("pros", [])
-    cons = sections.get("cons", [])
-    tldr = sections.get("tldr", "")
-
-    pros_text = '\n'.join([f'+{p}' for p in pros]) if pros else ""
-    cons_text = '\n'.join([f'-{c}' for c in cons]) if cons else ""
-
-    # Start building the review string
-    review = f"[{game_info}]\n"
-
-    # Only add sections if they contain content
-    if yapping.strip():
-        review += f"{yapping}\n\n"
-    
-    if gameplay.strip():
-        review += f"{gameplay}\n\n"
-    
-    if combat.strip():
-        review += f"{combat}\n\n"
-    
-    if art.strip():
-        review += f"{art}\n\n"
-    
-    if story.strip():
-        review += f"{story}\n\n"
-    
-    if pros_text:
-        review += f"Pros\n{pros_text}\n\n"
-    
-    if cons_text:
-        review += f"Cons\n{cons_text}\n\n"
-        
-    if tldr.strip():
-        review += f"Tl;Dr\n{tldr}"
-
-    return review.strip()  # Remove any trailing spaces/newlines
-
-
-    
 if __name__ == "__main__":
-    delete_old_files()
-    ensure_review_exists()
-    api_key = check_ai_usage()
-    open_editor_and_wait("review.txt")
-
-    try:
-        sections = parse_sections("review.txt")
-        if api_key:
-            print("AI feature is enabled.")
-            process_with_ai(sections, api_key)  # Process the review sections with AI if api_key exists
-        else:
-            print("AI feature is not enabled. Proceeding without AI.")
-
-        compiled_bbcode = generate_review_bbcode(sections)
-        compiled_text = generate_review(sections)
-
-        with open("compiled_review_bbcode.txt", "w", encoding="utf-8") as out:
-            out.write(compiled_bbcode)
-        with open("compiled_review.txt", "w", encoding="utf-8") as out:
-            out.write(compiled_text)
-
-        copy_bbcode_to_clipboard(compiled_bbcode)
-        print("\n✅ Styled review copied to clipboard (BBCode)!")
-        open_output_in_editor()
-
-    except Exception as e:
-        print(f"❌ ERROR: {e}")
-        print("Something went wrong during execution.")
-        print("Read the error above. If you're not sure what went wrong, press Enter to reset the review.txt to its default format.")
-        choice = input("Press [Enter] to reset review.txt, or [Ctrl+C] to cancel: ")
-        print("Restoring review to default state...")
-        generate_default_review()
+    if len(sys.argv) > 1 and sys.argv[1] == "auto":
+        sys.exit(run_unattended(sys.argv[2:]))
+    args = parse_args(sys.argv[1:])
+    run_instrumented(lambda: run_interactive(args), args.trace, args.profile)
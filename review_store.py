@@ -0,0 +1,211 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from contextlib import closing
+from review_generator import parse_sections, generate_review_outputs, collect_review_files, compiled_output_paths
+
+# Every stored review keeps its parsed sections and both rendered outputs. Section text is also indexed
+# with FTS5 (one row per section) so past reviews can be searched without reading any flat files.
+STORE_FILE = "reviews.sqlite"
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    game TEXT NOT NULL,
+    source TEXT,
+    added REAL NOT NULL,
+    sections TEXT NOT NULL,
+    bbcode TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS review_fts USING fts5(
+    section, content, review_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def open_store(path=STORE_FILE):
+    conn = sqlite3.connect(path)
+    # WAL lets searches run while a big import is writing, NORMAL sync is safe with WAL and much faster
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    try:
+        conn.executescript(STORE_SCHEMA)
+    except sqlite3.OperationalError as e:
+        conn.close()
+        if "fts5" in str(e):
+            raise RuntimeError(f"the SQLite library of this Python ({sqlite3.sqlite_version}) was built without FTS5")
+        raise
+    return conn
+
+def review_hash(sections):
+    # Same sections -> same hash, however the file was laid out (header case, blank lines, ...)
+    canonical = json.dumps(sections, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _section_text(value):
+    return "\n".join(value) if isinstance(value, list) else value
+
+def add_review(conn, sections, bbcode=None, text=None, source=None):
+    # Returns (review id, True if it was added or False if the same review was already stored)
+    content_hash = review_hash(sections)
+    row = conn.execute("SELECT id FROM reviews WHERE content_hash = ?", (content_hash,)).fetchone()
+    if row:
+        return row[0], False
+    if bbcode is None or text is None:
+        bbcode, text = generate_review_outputs(sections)
+    cursor = conn.execute(
+        "INSERT INTO reviews (content_hash, game, source, added, sections, bbcode, text) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (content_hash, sections.get("game") or "Unknown Game", source, time.time(),
+         json.dumps(sections, ensure_ascii=False), bbcode, text))
+    review_id = cursor.lastrowid
+    conn.executemany("INSERT INTO review_fts (section, content, review_id) VALUES (?, ?, ?)",
+                     [(name, _section_text(value), review_id) for name, value in sections.items()
+                      if name != "game" and _section_text(value).strip()])
+    return review_id, True
+
+def add_review_files(conn, filenames):
+    # One transaction for the whole import, committing per review would make this 100x slower
+    added = skipped = 0
+    errors = []
+    with conn:
+        for filename in filenames:
+            try:
+                _, is_new = add_review(conn, parse_sections(filename), source=os.path.abspath(filename))
+            except (OSError, UnicodeDecodeError) as e:
+                errors.append((filename, str(e)))
+                continue
+            if is_new:
+                added += 1
+            else:
+                skipped += 1
+    return added, skipped, errors
+
+def store_compiled_review(sections, bbcode, text, source=None, path=None):
+    # Used by the interactive scripts (--store) right after the outputs were written
+    try:
+        with closing(open_store(path or STORE_FILE)) as conn, conn:
+            review_id, is_new = add_review(conn, sections, bbcode, text, source and os.path.abspath(source))
+    except (sqlite3.Error, RuntimeError) as e:
+        print(f"⚠️ Could not save the review to the store: {e}")
+        return None
+    print(f"✅ Review saved to the store as #{review_id}." if is_new else f"Review already in the store as #{review_id}.")
+    return review_id
+
+def search_reviews(conn, query, section=None, limit=20):
+    # FTS5 query syntax: words, "exact phrases", prefix*, AND/OR/NOT, NEAR(...). Best matches first.
+    sql = ("SELECT f.review_id, r.game, f.section, snippet(review_fts, 1, '[', ']', '…', 12) "
+           "FROM review_fts f JOIN reviews r ON r.id = f.review_id WHERE review_fts MATCH ?")
+    params = [query]
+    if section:
+        sql += " AND f.section = ?"
+        params.append(section.lower())
+    sql += " ORDER BY bm25(review_fts) LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+def get_review(conn, review_id):
+    row = conn.execute("SELECT sections, bbcode, text FROM reviews WHERE id = ?", (review_id,)).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1], row[2]
+
+def iter_stored_reviews(conn, query=None):
+    # Yields (id, game, sections json, bbcode, text) straight from the cursor, never the whole store at once
+    if query:
+        return conn.execute("SELECT id, game, sections, bbcode, text FROM reviews WHERE id IN "
+                            "(SELECT review_id FROM review_fts WHERE review_fts MATCH ?) ORDER BY id", (query,))
+    return conn.execute("SELECT id, game, sections, bbcode, text FROM reviews ORDER BY id")
+
+def _slug(name):
+    return re.sub(r"[^\w-]+", "_", name).strip("_")[:40] or "review"
+
+def export_reviews(conn, output_dir, query=None, rerender=False):
+    # Writes compiled_<id>_<game>_bbcode.txt / compiled_<id>_<game>.txt for every (matching) review.
+    # With rerender the outputs are rendered again from the stored sections, e.g. after a format change.
+    os.makedirs(output_dir, exist_ok=True)
+    count = 0
+    for review_id, game, sections, bbcode, text in iter_stored_reviews(conn, query):
+        if rerender:
+            bbcode, text = generate_review_outputs(json.loads(sections))
+        bbcode_path, text_path = compiled_output_paths(f"{review_id}_{_slug(game)}.txt", output_dir)
+        with open(bbcode_path, "w", encoding="utf-8") as out:
+            out.write(bbcode)
+        with open(text_path, "w", encoding="utf-8") as out:
+            out.write(text)
+        count += 1
+    return count
+
+def store_stats(conn):
+    reviews, size = conn.execute("SELECT count(*), coalesce(sum(length(sections) + length(bbcode) + length(text)), 0) "
+                                 "FROM reviews").fetchone()
+    sections = conn.execute("SELECT count(*) FROM review_fts").fetchone()[0]
+    return {"reviews": reviews, "sections": sections, "text_bytes": size}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="review_store.py", description="Keep, search and re-render past reviews in SQLite.")
+    parser.add_argument("--db", default=STORE_FILE, help=f"store file (default: {STORE_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="parse review files and store them (unchanged reviews are skipped)")
+    add_parser.add_argument("targets", nargs="+", help="review files, directories or glob patterns")
+
+    search_parser = commands.add_parser("search", help="full-text search over section text")
+    search_parser.add_argument("query", help="FTS5 query, e.g. 'boss AND fight', '\"open world\"', 'grind*'")
+    search_parser.add_argument("-s", "--section", help="only search this section (e.g. pros)")
+    search_parser.add_argument("-n", "--limit", type=int, default=20)
+
+    show_parser = commands.add_parser("show", help="print a stored review")
+    show_parser.add_argument("id", type=int)
+    show_parser.add_argument("--bbcode", action="store_true", help="print the BBCode instead of the plain text")
+
+    export_parser = commands.add_parser("export", help="write stored reviews back out as compiled files")
+    export_parser.add_argument("output_dir")
+    export_parser.add_argument("-q", "--query", help="only reviews with a section matching this FTS5 query")
+    export_parser.add_argument("--rerender", action="store_true", help="render again from the stored sections")
+
+    commands.add_parser("stats", help="how much is stored")
+    args = parser.parse_args(argv)
+
+    try:
+        with closing(open_store(args.db)) as conn:
+            if args.command == "add":
+                files = collect_review_files(args.targets)
+                added, skipped, errors = add_review_files(conn, files)
+                for filename, error in errors:
+                    print(f"❌ {filename}: {error}")
+                print(f"✅ Stored {added} new reviews, {skipped} already stored.")
+                return 1 if errors else 0
+            if args.command == "search":
+                for review_id, game, section, snippet in search_reviews(conn, args.query, args.section, args.limit):
+                    print(f"#{review_id:<6} {game[:30]:<30} {section:<10} {snippet.replace(chr(10), ' / ')}")
+                return 0
+            if args.command == "show":
+                review = get_review(conn, args.id)
+                if review is None:
+                    print(f"❌ No review #{args.id} in {args.db}.")
+                    return 1
+                print(review[1] if args.bbcode else review[2])
+                return 0
+            if args.command == "export":
+                count = export_reviews(conn, args.output_dir, args.query, args.rerender)
+                print(f"✅ Exported {count} reviews to {args.output_dir}.")
+                return 0
+            stats = store_stats(conn)
+            print(f"{stats['reviews']} reviews, {stats['sections']} indexed sections, "
+                  f"{stats['text_bytes'] / (1 << 20):.1f} MB of text in {args.db}.")
+            return 0
+    except (sqlite3.Error, RuntimeError) as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,117 @@
+# parse_sections, generate_review_bbcode and generate_review exactly as they were before the render engine
+# (copied unchanged, trailing whitespace and all), the reference test_render.py compares the current code against.
+
+def parse_sections(filename):
+    sections = {}
+    current_section = None
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip()
+            if line.startswith("### "):
+                current_section = line[4:].strip().lower()
+                sections[current_section] = []
+            elif current_section:
+                sections[current_section].append(line)
+    return {
+        key: '\n'.join(value).strip() if key in ['main','gameplay','combat','art','story', 'tldr', 'game'] 
+        else [line.strip() for line in value if line.strip()]
+        for key, value in sections.items()
+    }
+
+def generate_review_bbcode(sections):
+    game_info = sections.get("game", "Unknown Game")
+    yapping = sections.get("main", "")
+    gameplay = sections.get("gameplay", "")
+    combat = sections.get("combat", "")
+    art = sections.get("art", "")
+    story = sections.get("story", "")
+    pros = sections.get("pros", [])
+    cons = sections.get("cons", [])
+    tldr = sections.get("tldr", "")
+
+    # BBCode formatting for the title
+    title_bbcode = f'[B][SIZE=6]{game_info}[/SIZE][/B]\n\n'
+
+    # Main body with newline after each line, check if content exists
+    body_bbcode = '\n'.join([f'{line}' for line in yapping.split('\n') if line.strip()])
+    if body_bbcode:  # Only add newline if body has content
+        body_bbcode += '\n\n'
+    
+    body1_bbcode = '\n'.join([f'{line}' for line in gameplay.split('\n') if line.strip()])
+    if body1_bbcode:  
+        body1_bbcode += '\n\n'
+    
+    body2_bbcode = '\n'.join([f'{line}' for line in combat.split('\n') if line.strip()])
+    if body2_bbcode: 
+        body2_bbcode += '\n\n'
+    
+    body3_bbcode = '\n'.join([f'{line}' for line in art.split('\n') if line.strip()])
+    if body3_bbcode:  
+        body3_bbcode += '\n\n'
+    
+    body4_bbcode = '\n'.join([f'{line}' for line in story.split('\n') if line.strip()])
+    if body4_bbcode:  
+        body4_bbcode += '\n\n'
+
+    pros_bbcode = ''
+    if pros:  
+        pros_bbcode = '[COLOR=rgb(0, 128, 0)][B]Pros[/B][/COLOR]\n'
+        pros_bbcode += '\n'.join([f'[COLOR=rgb(0, 128, 0)] +[/COLOR] {p}' for p in pros]) + '\n\n'
+
+    cons_bbcode = ''
+    if cons:  
+        cons_bbcode = '[COLOR=rgb(184, 49, 47)][B]Cons[/B][/COLOR]\n'
+        cons_bbcode += '\n'.join([f'[COLOR=rgb(184, 49, 47)] -[/COLOR] {c}' for c in cons]) + '\n\n'
+
+    tldr_bbcode = ''
+    if tldr.strip():  
+        tldr_bbcode = '[B][COLOR=rgb(255, 165, 0)]TL;DR:[/COLOR][/B] ' 
+        tldr_bbcode += f'{tldr}\n'
+
+    # Combine everything with appropriate line breaks between sections
+    return title_bbcode + body_bbcode + body1_bbcode + body2_bbcode + body3_bbcode + body4_bbcode + pros_bbcode + cons_bbcode + tldr_bbcode
+
+    
+def generate_review(sections):
+    game_info = sections.get("game", "Unknown Game")
+    yapping = sections.get("main", "")
+    gameplay = sections.get("gameplay", "")
+    combat = sections.get("combat", "")
+    art = sections.get("art", "")
+    story = sections.get("story", "")
+    pros = sections.get("pros", [])
+    cons = sections.get("cons", [])
+    tldr = sections.get("tldr", "")
+
+    pros_text = '\n'.join([f'+{p}' for p in pros]) if pros else ""
+    cons_text = '\n'.join([f'-{c}' for c in cons]) if cons else ""
+
+    # Start building the review string
+    review = f"[{game_info}]\n"
+
+    # Only add sections if they contain content
+    if yapping.strip():
+        review += f"{yapping}\n\n"
+    
+    if gameplay.strip():
+        review += f"{gameplay}\n\n"
+    
+    if combat.strip():
+        review += f"{combat}\n\n"
+    
+    if art.strip():
+        review += f"{art}\n\n"
+    
+    if story.strip():
+        review += f"{story}\n\n"
+    
+    if pros_text:
+        review += f"Pros\n{pros_text}\n\n"
+    
+    if cons_text:
+        review += f"Cons\n{cons_text}\n\n"
+        
+    if tldr.strip():
+        review += f"Tl;Dr\n{tldr}"
+
+    return review.strip()  # Remove any trailing spaces/newlines
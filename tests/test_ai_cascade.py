@@ -0,0 +1,58 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+import review_generator_ai
+from ai_stub_server import StubConfig, start_stub_server, stub_base_url
+from review_generator_ai import AIOptions, call_ai_cascade, parse_cascade
+
+TEXT = "A moody metroidvania with tight controls."
+
+
+class CascadeAgainstStubServerTest(unittest.TestCase):
+    def setUp(self):
+        saved = dict(review_generator_ai.ai_cascade_stats)
+        review_generator_ai.ai_cascade_stats.clear()
+        self.addCleanup(review_generator_ai.ai_cascade_stats.update, saved)
+        self.addCleanup(review_generator_ai.ai_cascade_stats.clear)
+
+    def cascade(self, responses, spec="fast,big"):
+        # The stub hands out the canned answers in turn, one per request
+        server = start_stub_server(StubConfig(latency=0.0, responses=responses))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        options = AIOptions(backend="openai", base_url=stub_base_url(server), cache="off", cascade=parse_cascade(spec))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = call_ai_cascade("main", TEXT, "test-token", options)
+        return result, server.stats["completed"], output.getvalue()
+
+    def calls(self, model):
+        stats = review_generator_ai.ai_cascade_stats[model]
+        return stats["calls"], stats["passed"], stats["escalated"]
+
+    def test_escalates_a_refused_answer(self):
+        better = "A moody, atmospheric metroidvania with tight, responsive controls."
+        result, requests, output = self.cascade(["I'm sorry, but I can't help with that.", better])
+        self.assertEqual(result, better)
+        self.assertEqual(requests, 2)
+        self.assertEqual(self.calls("fast"), (1, 0, 1))
+        self.assertEqual(self.calls("big"), (1, 1, 0))
+        self.assertIn("fast's answer for 'main' looks like a refusal, asking big", output)
+
+    def test_stops_at_the_first_answer_that_passes(self):
+        result, requests, _ = self.cascade(None)
+        self.assertEqual(result, f"Enhanced: {TEXT}")
+        self.assertEqual(requests, 1)
+        self.assertEqual(self.calls("fast"), (1, 1, 0))
+        self.assertNotIn("big", review_generator_ai.ai_cascade_stats)
+
+    def test_last_answer_is_kept_even_when_it_fails(self):
+        result, requests, _ = self.cascade(["I'm sorry, but I can't help with that."])
+        self.assertEqual(result, "I'm sorry, but I can't help with that.")
+        self.assertEqual(requests, 2)
+        self.assertEqual(self.calls("big"), (1, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
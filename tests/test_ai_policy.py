@@ -0,0 +1,52 @@
+import os
+import json
+import tempfile
+import unittest
+
+from ai_policy import PolicyError, SectionPolicy, check_enhancement, default_section_policy, load_policy
+
+
+class PolicyTest(unittest.TestCase):
+    def load(self, data, **overrides):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "policy.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data if isinstance(data, str) else json.dumps(data))
+            return load_policy(path, **overrides)
+
+    def ratios(self, policy, section):
+        settings = policy.for_section(section)
+        return settings.min_ratio, settings.max_ratio
+
+    def test_tldr_may_be_shorter_by_default(self):
+        policy = load_policy()
+        self.assertEqual(self.ratios(policy, "tldr"), (0.2, 3.0))
+        self.assertEqual(self.ratios(policy, "main"), (1.0, 4.0))
+        self.assertEqual(policy.for_section("tldr"), default_section_policy("tldr"))
+        self.assertTrue(check_enhancement("Great game, buy it on sale.", "Great game.", policy.for_section("tldr"))[0])
+        self.assertFalse(check_enhancement("Great game, buy it on sale.", "Great game.", policy.for_section("main"))[0])
+
+    def test_later_layers_win(self):
+        # built-in < file defaults < file section < command line
+        self.assertEqual(self.ratios(load_policy(None, min_ratio=0.9, max_ratio=1.5), "tldr"), (0.9, 1.5))
+        self.assertEqual(self.ratios(self.load({"defaults": {"min_ratio": 0.5}}), "tldr"), (0.5, 3.0))
+        policy = self.load({"defaults": {"min_ratio": 0.5}, "sections": {"tldr": {"min_ratio": 0.1}, "Story": {"max_ratio": 2.5}}})
+        self.assertEqual(self.ratios(policy, "tldr"), (0.1, 3.0))
+        self.assertEqual(self.ratios(policy, "story"), (0.5, 2.5))
+        self.assertEqual(self.ratios(policy, "art"), (0.5, 4.0))
+        policy = self.load({"sections": {"tldr": {"min_ratio": 0.1}, "story": {"max_ratio": 2.5}}}, min_ratio=0.7, max_ratio=None)
+        self.assertEqual(self.ratios(policy, "tldr"), (0.7, 3.0))
+        self.assertEqual(self.ratios(policy, "story"), (0.7, 2.5))
+        self.assertEqual(self.load({"sections": {"tldr": {"enhance": False}}}).for_section("tldr"),
+                         SectionPolicy(enhance=False, min_ratio=0.2, max_ratio=3.0))
+
+    def test_rejects_malformed_files(self):
+        for data in ("[1]", "{", {"sections": [1]}, {"sections": {"x": 3}}, {"defaults": {"min_ratio": "1.0"}},
+                     {"defaults": {"enhance": "yes"}}, {"defaults": {"colour": "red"}}, {"sections": {"tldr": {"max_ratio": True}}},
+                     {"sections": {"tldr": {"accept": "maybe"}}}, {"defaults": {"min_ratio": -1}}):
+            with self.subTest(data=data), self.assertRaises(PolicyError):
+                self.load(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
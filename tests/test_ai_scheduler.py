@@ -0,0 +1,83 @@
+import unittest
+
+from ai_backends import create_ai_client
+from ai_scheduler import BudgetExceededError, RequestScheduler, status_code
+from ai_stub_server import StubConfig, start_stub_server, stub_base_url
+
+
+class SchedulerAgainstStubServerTest(unittest.TestCase):
+    def start_server(self, **config):
+        server = start_stub_server(StubConfig(latency=0.0, seed=7, **config))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, create_ai_client("openai", "test-token", stub_base_url(server))
+
+    def scheduler(self, **kwargs):
+        # Sleeping only moves a fake clock forward, so the rate limits are tested without waiting for them
+        now, waits = [0.0], []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+        return RequestScheduler(sleep=sleep, clock=lambda: now[0], **kwargs), waits
+
+    def send(self, client, text):
+        def attempt():
+            response = client.chat.completions.create(
+                model="stub", messages=[{"role": "user", "content": f"Enhance: {text}"}], max_tokens=50)
+            return response.choices[0].message.content, response.usage.total_tokens
+        return attempt
+
+    def test_retries_429s_until_every_request_succeeds(self):
+        server, client = self.start_server(rate_limit_rate=0.5, retry_after=0.25)
+        scheduler, waits = self.scheduler(max_retries=20)
+        results = [scheduler.run(self.send(client, f"review {n}"), 60) for n in range(20)]
+
+        self.assertEqual(results, [f"Enhanced: review {n}" for n in range(20)])
+        limited = server.stats["rate_limited"]
+        self.assertGreater(limited, 0)
+        self.assertEqual(scheduler.stats["retries"], limited)
+        self.assertEqual(scheduler.stats["requests"], 20 + limited)
+        # Every retry waited for the server's Retry-After, not its own backoff
+        self.assertEqual(waits, [0.25] * limited)
+
+    def test_caps_retry_after_at_max_delay(self):
+        _, client = self.start_server(rate_limit_rate=0.5, retry_after=86400)
+        scheduler, waits = self.scheduler(max_retries=20, max_delay=5.0)
+        for n in range(10):
+            scheduler.run(self.send(client, f"review {n}"), 60)
+        self.assertTrue(waits)
+        self.assertEqual(set(waits), {5.0})
+
+    def test_gives_up_after_max_retries(self):
+        server, client = self.start_server(rate_limit_rate=1.0, retry_after=0.0)
+        scheduler, _ = self.scheduler(max_retries=2)
+        with self.assertRaises(Exception) as raised:
+            scheduler.run(self.send(client, "review"), 60)
+        self.assertEqual(status_code(raised.exception), 429)
+        self.assertEqual(server.stats["rate_limited"], 3)
+        self.assertEqual(scheduler.stats["requests"], 3)
+
+    def test_stops_at_the_token_budget(self):
+        _, client = self.start_server()
+        scheduler, _ = self.scheduler(token_budget=100)
+        scheduler.run(self.send(client, "review"), 60)
+        used = scheduler.stats["tokens"]
+        # Budgets count the tokens really used, not the estimate
+        self.assertLess(used, 60)
+        scheduler.run(self.send(client, "review"), 100 - used)
+        with self.assertRaises(BudgetExceededError):
+            scheduler.run(self.send(client, "review"), 100 - scheduler.stats["tokens"] + 1)
+        self.assertEqual(scheduler.stats["requests"], 2)
+
+    def test_waits_for_the_request_rate_limit(self):
+        _, client = self.start_server()
+        scheduler, waits = self.scheduler(requests_per_minute=60)
+        for n in range(62):
+            scheduler.run(self.send(client, f"review {n}"), 10)
+        # The bucket starts full with 60 requests, the next ones wait a second each
+        self.assertEqual(waits, [1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from types import SimpleNamespace
+
+import review_generator_ai
+from ai_scheduler import RequestScheduler
+from review_generator_ai import AIOptions, call_ai_to_generate_content
+
+
+def chunk(token):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+
+class BreakingStreamClient:
+    # The first answer breaks off after two tokens, the next one comes through whole
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return self.stream(self.calls == 1)
+
+    def stream(self, breaks):
+        yield chunk("Great ")
+        yield chunk("game")
+        if breaks:
+            raise ConnectionError("connection reset")
+        yield chunk(", really.")
+
+
+class StreamRetryTest(unittest.TestCase):
+    def call(self, on_token):
+        client = BreakingStreamClient()
+        key = ("stub-stream", None, "test-token")
+        review_generator_ai._ai_clients[key] = client
+        self.addCleanup(review_generator_ai._ai_clients.pop, key)
+        options = AIOptions(backend="stub-stream", cache="off", stream=True,
+                            scheduler=RequestScheduler(max_retries=3, sleep=lambda seconds: None))
+        return call_ai_to_generate_content("Enhance: great game", "test-token", options, on_token=on_token), client
+
+    def test_shown_answer_is_not_retried_from_the_start(self):
+        shown = []
+        result, client = self.call(shown.append)
+        self.assertIsNone(result)
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(shown, ["Great ", "game"])
+
+    def test_unseen_answer_is_retried(self):
+        result, client = self.call(None)
+        self.assertEqual(result, "Great game, really.")
+        self.assertEqual(client.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
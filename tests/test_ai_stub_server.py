@@ -0,0 +1,40 @@
+import json
+import unittest
+import http.client
+
+from ai_stub_server import StubConfig, start_stub_server
+
+
+class StubServerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = start_stub_server(StubConfig(latency=0.0))
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def post(self, body, length):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=30)
+        self.addCleanup(connection.close)
+        connection.putrequest("POST", "/v1/chat/completions")
+        connection.putheader("Content-Type", "application/json")
+        connection.putheader("Content-Length", length)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_answers_a_chat_completion(self):
+        body = json.dumps({"model": "stub", "messages": [{"role": "user", "content": "Enhance: fun"}]}).encode()
+        status, answer = self.post(body, str(len(body)))
+        self.assertEqual(status, 200)
+        self.assertEqual(answer["choices"][0]["message"]["content"], "Enhanced: fun")
+
+    def test_rejects_a_malformed_content_length(self):
+        for length in ("abc", "-5"):
+            with self.subTest(length=length):
+                status, error = self.post(b"{}", length)
+                self.assertEqual(status, 400)
+                self.assertEqual(error["error"]["type"], "invalid_request_error")
+        self.assertEqual(self.server.stats["errors"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
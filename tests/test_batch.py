@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+
+from review_generator import run_batch
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        for folder, game in (("a", "Halo"), ("b", "Doom")):
+            os.makedirs(os.path.join(self.root, "in", folder))
+            with open(os.path.join(self.root, "in", folder, "review.txt"), "w", encoding="utf-8") as f:
+                f.write(f"### game\n{game}\n### pros\nFast\n")
+
+    def run_batch(self, *argv):
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+            return run_batch(list(argv))
+
+    def test_same_named_reviews_get_their_own_outputs(self):
+        out = os.path.join(self.root, "out")
+        self.assertEqual(self.run_batch(os.path.join(self.root, "in", "**", "*.txt"), "-o", out, "-j", "2"), 0)
+        for folder, game in (("a", "Halo"), ("b", "Doom")):
+            with open(os.path.join(out, folder, "compiled_review.txt"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), f"[{game}]\nPros\n+Fast")
+        self.assertEqual(sorted(name for name in os.listdir(os.path.join(out, "a")) if name.endswith(".tmp")), [])
+
+    def test_rejects_worker_counts_below_one(self):
+        for jobs in ("0", "-3", "many"):
+            with self.subTest(jobs=jobs), self.assertRaises(SystemExit) as raised:
+                self.run_batch(self.root, "-j", jobs)
+            self.assertEqual(raised.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
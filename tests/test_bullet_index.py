@@ -0,0 +1,81 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import closing
+
+from bullet_index import (DEFAULT_THRESHOLD, LSH_BANDS, band_keys, duplicate_clusters, index_review, index_stats,
+                          jaccard, minhash, normalize_bullet, open_index, shingles, similar_bullets)
+
+
+def signature_of(text):
+    return minhash(shingles(normalize_bullet(text)))
+
+
+class MinHashTest(unittest.TestCase):
+    def test_identical_wording_gives_identical_signature(self):
+        self.assertEqual(signature_of("Great soundtrack!"), signature_of("  great   SOUNDTRACK "))
+        self.assertEqual(band_keys(signature_of("Great soundtrack")), band_keys(signature_of("great soundtrack.")))
+        self.assertEqual(len(band_keys(signature_of("Great soundtrack"))), LSH_BANDS)
+
+    def test_signature_agreement_estimates_jaccard(self):
+        rng = random.Random(3)
+        words = ["combat", "feels", "great", "boring", "story", "long", "loading", "times", "music", "the", "is"]
+        for _ in range(30):
+            a = " ".join(rng.choice(words) for _ in range(8))
+            b = " ".join(rng.choice(words) for _ in range(8))
+            exact = jaccard(shingles(normalize_bullet(a)), shingles(normalize_bullet(b)))
+            agreement = sum(x == y for x, y in zip(signature_of(a), signature_of(b))) / len(signature_of(a))
+            # 48 rows, the estimate's standard error is at most ~0.07
+            self.assertLess(abs(agreement - exact), 0.3)
+
+
+class BulletIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.conn = open_index(os.path.join(tmp.name, "bullets.sqlite"))
+        self.addCleanup(self.conn.close)
+
+    def index(self, *reviews):
+        with self.conn:
+            return [index_review(self.conn, review) for review in reviews]
+
+    def test_finds_reworded_bullets_and_not_unrelated_ones(self):
+        self.index({"pros": ["Great soundtrack with memorable boss themes", "Tight controls"], "cons": ["Long loading times"]},
+                   {"pros": ["great soundtrack, memorable boss themes!"], "cons": ["Very long loading times"]},
+                   {"pros": ["Beautiful hand drawn art"], "cons": ["Short campaign"]})
+
+        matches = similar_bullets(self.conn, "Great soundtrack with memorable boss theme")
+        self.assertEqual([match[3] for match in matches],
+                         ["Great soundtrack with memorable boss themes", "great soundtrack, memorable boss themes!"])
+        self.assertTrue(all(match[0] >= DEFAULT_THRESHOLD for match in matches))
+        self.assertEqual(similar_bullets(self.conn, "Online multiplayer is dead"), [])
+        self.assertEqual(similar_bullets(self.conn, "Long loading times", section="pros"), [])
+
+        clusters = duplicate_clusters(self.conn)
+        self.assertEqual([sorted(row[2] for row in cluster) for cluster in clusters],
+                         [["Great soundtrack with memorable boss themes", "great soundtrack, memorable boss themes!"],
+                          ["Long loading times", "Very long loading times"]])
+
+    def test_indexes_each_review_once_and_counts_repeated_wordings(self):
+        review = {"pros": ["Tight controls", "tight controls!"], "cons": []}
+        self.assertEqual(self.index(review, review, {"pros": "Tight controls\nGreat art"}), [1, None, 1])
+        self.assertEqual(index_stats(self.conn)["bullets"], 2)
+        (match,) = similar_bullets(self.conn, "Tight controls")
+        self.assertEqual((match[0], match[4]), (1.0, 3))
+
+    def test_clusters_larger_than_one_query(self):
+        self.index({"pros": [f"Great soundtrack, track {n:02d}" for n in range(40)]})
+        # Like SQLite before 3.32 (999 variables), scaled down
+        self.conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 12)
+        with mock.patch("bullet_index.SQL_VARIABLES", 7):
+            (cluster,) = duplicate_clusters(self.conn, threshold=0.6)
+        self.assertEqual(len(cluster), 40)
+        self.assertEqual([row[0] for row in cluster], sorted(row[0] for row in cluster))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import gzip
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+import review_generator
+from review_generator import _archive_sink, write_atomic
+
+
+class WriteAtomicTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "compiled_review.txt")
+
+    def mode(self):
+        return stat.S_IMODE(os.stat(self.path).st_mode)
+
+    def test_replaces_the_file_and_keeps_its_mode(self):
+        with open(self.path, "w") as f:
+            f.write("old")
+        os.chmod(self.path, 0o640)
+        write_atomic(self.path, "new ünïcode")
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "new ünïcode")
+        self.assertEqual(self.mode(), 0o640)
+        self.assertEqual(os.listdir(self.dir), ["compiled_review.txt"])
+
+    def test_new_file_gets_the_umask_mode(self):
+        write_atomic(self.path, b"bytes")
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"bytes")
+        self.assertEqual(self.mode(), 0o666 & ~review_generator._UMASK)
+
+    def test_failed_write_leaves_the_old_file(self):
+        write_atomic(self.path, "old")
+        with self.assertRaises(TypeError):
+            write_atomic(self.path, None)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.dir), ["compiled_review.txt"])
+
+
+class ArchiveSinkTest(unittest.TestCase):
+    def test_never_overwrites_a_copy(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        archive = os.path.join(tmp.name, "review_archive")
+        # Every run in the same millisecond, so they all want the same name
+        with mock.patch.object(review_generator, "ARCHIVE_DIR", archive):
+            with mock.patch("time.time_ns", return_value=1_700_000_000_123_456_789):
+                for n in range(5):
+                    _archive_sink(f"[b]{n}[/b]", f"review {n}")
+
+        names = sorted(os.listdir(archive))
+        self.assertEqual(len(names), 10)
+        texts = set()
+        for name in names:
+            if not name.endswith("_bbcode.txt.gz"):
+                self.assertIn(".123", name)
+                with gzip.open(os.path.join(archive, name), "rt", encoding="utf-8") as f:
+                    texts.add(f.read())
+        self.assertEqual(texts, {f"review {n}" for n in range(5)})
+
+
+if __name__ == "__main__":
+    unittest.main()
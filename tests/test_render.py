@@ -0,0 +1,87 @@
+import os
+import random
+import tempfile
+import unittest
+
+import baseline_review
+from review_generator import (Review, generate_review, generate_review_bbcode, generate_review_outputs, parse_review,
+                              parse_sections, parse_sections_incremental)
+
+# Differential test: random review files go through the current parser and renderers and through the
+# original implementation, and every result has to be identical.
+HEADERS = ["game", "main", "gameplay", "combat", "art", "story", "pros", "cons", "tldr", "Pros", "  TLDR ", "GAME",
+           "notes", "extra stuff", "tl;dr"]
+WORDS = ["fun", "grindy", "Great", "boss", "fights", "ünïcode", "{}", "[B]", "+", "-", "…", "30fps", "\t"]
+
+
+def random_line(rng):
+    roll = rng.random()
+    if roll < 0.15:
+        return "### " + rng.choice(HEADERS) + rng.choice(["", " ", "\t"])
+    if roll < 0.2:
+        return rng.choice(["###nospace", "#### four", "##", "###", "### "])
+    if roll < 0.35:
+        return rng.choice(["", " ", "\t", "   "])
+    line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12)))
+    return rng.choice(["", " ", "  ", "- ", "+"]) + line + rng.choice(["", " ", "\t", "."])
+
+def random_review(rng):
+    lines = [random_line(rng) for _ in range(rng.randint(0, 60))]
+    if rng.random() < 0.5:
+        lines.insert(0, "### game")
+    return rng.choice(["\n", "\r\n"]).join(lines) + rng.choice(["", "\n", "\n\n"])
+
+
+class RenderDifferentialTest(unittest.TestCase):
+    CASES = 400
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def reviews(self):
+        rng = random.Random(20240601)
+        path = os.path.join(self.tmp.name, "review.txt")
+        for case in range(self.CASES):
+            text = random_review(rng)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            yield case, path, text
+
+    def test_matches_baseline(self):
+        previous = None
+        for case, path, text in self.reviews():
+            with self.subTest(case=case):
+                expected = baseline_review.parse_sections(path)
+                expected_bbcode = baseline_review.generate_review_bbcode(expected)
+                expected_text = baseline_review.generate_review(expected)
+
+                sections = parse_sections(path)
+                self.assertEqual(sections, expected)
+                self.assertEqual(generate_review_bbcode(sections), expected_bbcode)
+                self.assertEqual(generate_review(sections), expected_text)
+                self.assertEqual(generate_review_outputs(sections), (expected_bbcode, expected_text))
+
+                review = parse_review(path)
+                self.assertEqual(review.to_dict(), expected)
+                self.assertEqual(Review(expected).to_dict(), expected)
+                self.assertEqual(generate_review_outputs(review), (expected_bbcode, expected_text))
+
+                # Same text read by the editor watcher, once from scratch and once reusing the last file's cache
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                self.assertEqual(parse_sections_incremental(text)[0], expected)
+                incremental, previous, _ = parse_sections_incremental(text, previous)
+                self.assertEqual(incremental, expected)
+
+    def test_incremental_reparses_only_changed_sections(self):
+        text = "### game\nHalo\n### main\nFun.\n### pros\n+ shooting\n"
+        _, cache, reparsed = parse_sections_incremental(text)
+        self.assertEqual(reparsed, 3)
+        sections, _, reparsed = parse_sections_incremental(text.replace("Fun.", "Very fun."), cache)
+        self.assertEqual(reparsed, 1)
+        self.assertEqual(sections, {"game": "Halo", "main": "Very fun.", "pros": ["+ shooting"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
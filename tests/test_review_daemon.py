@@ -0,0 +1,85 @@
+import json
+import unittest
+import http.client
+
+from ai_stub_server import StubConfig, start_stub_server, stub_base_url
+from review_daemon import ReviewRequestError, call_daemon, start_daemon
+from review_generator_ai import AIOptions
+
+REVIEW = """### game
+Hollow Knight
+### main
+A moody metroidvania.
+### pros
+Tight controls
+  Great art
+### cons
+Hard to find your way
+### tldr
+Buy it.
+"""
+
+
+class ReviewDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.daemon = start_daemon()
+        self.addCleanup(self.daemon.server_close)
+        self.addCleanup(self.daemon.shutdown)
+        self.port = self.daemon.server_address[1]
+
+    def call(self, path, payload):
+        return call_daemon(path, payload, port=self.port, timeout=30)
+
+    def enable_ai(self):
+        stub = start_stub_server(StubConfig(latency=0.0))
+        self.addCleanup(stub.server_close)
+        self.addCleanup(stub.shutdown)
+        self.daemon.api_key = "test-token"
+        self.daemon.ai_options = AIOptions(backend="openai", base_url=stub_base_url(stub), cache="off")
+
+    def test_compiled_sections_can_be_sent_back(self):
+        compiled = self.call("/compile", {"text": REVIEW})
+        self.assertEqual(compiled["sections"]["pros"], ["Tight controls", "Great art"])
+        again = self.call("/compile", {"sections": compiled["sections"]})
+        self.assertEqual((again["bbcode"], again["text"]), (compiled["bbcode"], compiled["text"]))
+
+    def test_compile_then_enhance(self):
+        self.enable_ai()
+        compiled = self.call("/compile", {"text": REVIEW})
+        enhanced = self.call("/enhance", {"sections": compiled["sections"], "keys": ["main", "tldr"]})["enhanced"]
+        self.assertEqual(enhanced, {"main": "Enhanced: A moody metroidvania.", "tldr": "Enhanced: Buy it."})
+
+    def test_rejects_malformed_sections(self):
+        for sections in ({"main": ["A", "list"]}, {"pros": ["ok", 3]}, {"cons": None}):
+            with self.subTest(sections=sections), self.assertRaises(ReviewRequestError):
+                self.call("/compile", {"sections": sections})
+        self.enable_ai()
+        with self.assertRaises(ReviewRequestError):
+            self.call("/enhance", {"text": REVIEW, "keys": "main"})
+
+    def raw_post(self, headers, body=b'{"text": "### game\\nX"}'):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        self.addCleanup(connection.close)
+        connection.putrequest("POST", "/compile", skip_host="Host" in headers)
+        for name, value in dict({"Content-Length": str(len(body))}, **headers).items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_only_accepts_json_from_local_pages(self):
+        json_type = {"Content-Type": "application/json"}
+        self.assertEqual(self.raw_post(json_type)[0], 200)
+        self.assertEqual(self.raw_post(dict(json_type, Origin=f"http://localhost:{self.port}"))[0], 200)
+        # What a form or fetch() on another site can send without a CORS preflight
+        self.assertEqual(self.raw_post({"Content-Type": "text/plain"})[0], 415)
+        self.assertEqual(self.raw_post(dict(json_type, Origin="https://evil.example"))[0], 403)
+        self.assertEqual(self.raw_post(dict(json_type, Origin="null"))[0], 403)
+        # DNS rebinding: the browser still sends the attacker's host name
+        self.assertEqual(self.raw_post(dict(json_type, Host=f"evil.example:{self.port}"))[0], 403)
+        self.assertEqual(self.raw_post(dict(json_type, Host="[::1"))[0], 403)
+        self.assertEqual(self.raw_post(dict(json_type, **{"Content-Length": "abc"}))[0], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
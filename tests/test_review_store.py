@@ -0,0 +1,69 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import closing, redirect_stdout
+
+from review_generator import parse_sections
+from review_store import (add_review, add_review_files, get_review, open_store, search_reviews, store_compiled_review,
+                          store_stats)
+
+HOLLOW = "### game\nHollow Knight\n### main\nA moody metroidvania with a café.\n### pros\nTight controls\nGreat art\n"
+CELESTE = "### game\nCeleste\n### main\nA hard platformer.\n### cons\nHard to find your way at first\n"
+
+
+class ReviewStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "reviews.sqlite")
+        self.conn = open_store(self.path)
+        self.addCleanup(self.conn.close)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_stores_the_same_review_once(self):
+        # Same sections laid out differently: header case and blank lines don't make a new review
+        files = [self.write("a.txt", HOLLOW), self.write("b.txt", CELESTE),
+                 self.write("c.txt", HOLLOW.replace("### pros", "\n### PROS\n"))]
+        self.assertEqual(add_review_files(self.conn, files), (2, 1, []))
+        self.assertEqual(add_review_files(self.conn, files), (0, 3, []))
+        self.assertEqual(store_stats(self.conn)["reviews"], 2)
+
+        sections = parse_sections(files[0])
+        review_id, is_new = add_review(self.conn, sections)
+        self.assertFalse(is_new)
+        self.assertEqual(get_review(self.conn, review_id)[0], sections)
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(store_compiled_review(sections, "bb", "text", path=self.path), review_id)
+        self.assertEqual(store_stats(self.conn)["reviews"], 2)
+
+    def test_searches_section_text(self):
+        add_review_files(self.conn, [self.write("a.txt", HOLLOW), self.write("b.txt", CELESTE)])
+
+        (match,) = search_reviews(self.conn, "controls")
+        self.assertEqual(match[1:3], ("Hollow Knight", "pros"))
+        self.assertIn("[controls]", match[3])
+        # Accents are folded both ways
+        self.assertEqual([row[1] for row in search_reviews(self.conn, "cafe")], ["Hollow Knight"])
+        self.assertEqual({row[1] for row in search_reviews(self.conn, "hard")}, {"Celeste"})
+        self.assertEqual([row[2] for row in search_reviews(self.conn, "hard", section="CONS")], ["cons"])
+        self.assertEqual(search_reviews(self.conn, "metroidvania", section="pros"), [])
+        # The game name is stored with the review but is not a searchable section
+        self.assertEqual(search_reviews(self.conn, "celeste"), [])
+
+    def test_reopening_keeps_the_reviews(self):
+        add_review_files(self.conn, [self.write("a.txt", HOLLOW)])
+        with closing(open_store(self.path)) as conn:
+            self.assertEqual(store_stats(conn), store_stats(self.conn))
+            self.assertEqual(len(search_reviews(conn, "art")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import unittest
+from concurrent.futures import Future
+
+from review_generator_ai import AIOptions, SpeculativeEnhancer
+
+
+class RecordingPool:
+    # Stands in for the thread pool: records what would be sent to the AI
+    def __init__(self):
+        self.sent = []
+
+    def submit(self, fn, key, text, *args):
+        self.sent.append((key, text))
+        return Future()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class SpeculativeEnhancerTest(unittest.TestCase):
+    def enhancer(self):
+        enhancer = SpeculativeEnhancer("review.txt", "test-token", AIOptions(), debounce=3)
+        enhancer.pool.shutdown()
+        enhancer.pool = RecordingPool()
+        return enhancer
+
+    def test_only_sends_sections_edited_and_then_left_alone(self):
+        enhancer = self.enhancer()
+        start = {"main": "Last review's intro.", "tldr": "Short."}
+        enhancer._update(start, 0)
+        enhancer._update(start, 10)
+        self.assertEqual(enhancer.pool.sent, [])
+
+        edited = dict(start, main="A new intro.")
+        enhancer._update(edited, 11)
+        enhancer._update(edited, 12)
+        self.assertEqual(enhancer.pool.sent, [])
+        enhancer._update(edited, 14)
+        self.assertEqual(enhancer.pool.sent, [("main", "A new intro.")])
+        self.assertEqual(list(enhancer.results_for(edited)), ["main"])
+
+        # Editing again drops the job, its answer is for text that no longer exists
+        job = enhancer.jobs["main"][1]
+        enhancer._update(dict(edited, main="A newer intro."), 15)
+        self.assertTrue(job.cancelled())
+        self.assertEqual(enhancer.results_for(edited), {})
+
+    def test_shutdown_stops_queued_calls_and_can_be_repeated(self):
+        enhancer = SpeculativeEnhancer("missing-review.txt", "test-token", AIOptions(concurrency=2), poll_interval=0.01).start()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        # Both workers busy, so the next call waits in the queue
+        running = [enhancer.pool.submit(release.wait, 5) for _ in range(2)]
+        queued = enhancer.pool.submit(lambda: None)
+        enhancer.shutdown()
+        enhancer.shutdown()
+        self.assertTrue(queued.cancelled())
+        self.assertFalse(enhancer.thread.is_alive())
+        release.set()
+        self.assertTrue(all(future.result(timeout=5) for future in running))
+
+
+if __name__ == "__main__":
+    unittest.main()
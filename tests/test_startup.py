@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import unittest
+
+from bench_startup import HERE, imported_by, parse_importtime
+
+# Only needed by some runs, so review_generator imports them where they are used
+LAZY_MODULES = ["argparse", "subprocess", "platform", "tempfile", "gzip", "glob", "threading", "concurrent.futures",
+                "ctypes", "sqlite3", "json"]
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:        80 |         80 |   _struct
+import time:       300 |        380 | struct
+import time:        50 |         50 |   tracing_helper
+import time:       400 |        450 |     mmap
+import time:      1000 |       1900 | review_generator
+"""
+
+
+class StartupTest(unittest.TestCase):
+    def test_parses_importtime_output(self):
+        entries = parse_importtime(IMPORTTIME + "unrelated line\n")
+        self.assertEqual(entries[0], ("_io", 0, 0.12, 0.12))
+        self.assertEqual(entries[-1], ("review_generator", 0, 1.0, 1.9))
+        self.assertEqual([entry[0] for entry in imported_by(entries, "review_generator")],
+                         ["tracing_helper", "mmap", "review_generator"])
+        self.assertEqual([entry[0] for entry in imported_by(entries, "struct")], ["_struct", "struct"])
+
+    def test_review_generator_imports_lazily(self):
+        check = ("import sys; before = set(sys.modules); import review_generator; "
+                 f"print(' '.join(sorted(set({LAZY_MODULES!r}) & (set(sys.modules) - before))))")
+        loaded = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, cwd=HERE,
+                                check=True).stdout.split()
+        self.assertEqual(loaded, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import queue
+import platform
+import tempfile
+import threading
+import unittest
+
+from review_generator import _poll_changes, file_changes
+
+
+class FileChangesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "review.txt")
+        self.write("### game\nHalo\n")
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def collect(self, changes):
+        # Saves seen by the watcher arrive on a queue, so a missing one times out instead of hanging the test
+        seen = queue.Queue()
+        threading.Thread(target=lambda: [seen.put(True) for _ in changes], daemon=True).start()
+        return seen
+
+    def test_saves_before_the_first_wait_are_not_lost(self):
+        for changes in (file_changes(self.path, 0.01), _poll_changes(self.path, 0.01)):
+            with self.subTest(changes=changes):
+                # e.g. saved while watch_review was still compiling, before it started iterating
+                self.write("### game\nHalo 2\n")
+                self.assertTrue(self.collect(changes).get(timeout=5))
+
+    @unittest.skipUnless(platform.system() == "Linux", "inotify is Linux only")
+    def test_half_written_new_file_is_not_a_save(self):
+        os.remove(self.path)
+        seen = self.collect(file_changes(self.path))
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("### game\n")
+            f.flush()
+            with self.assertRaises(queue.Empty):
+                seen.get(timeout=0.3)
+            f.write("Halo\n")
+        self.assertTrue(seen.get(timeout=5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import _thread
+
+# Named spans for every phase of a run, written as Chrome trace-event JSON (open it in chrome://tracing
+# or https://ui.perfetto.dev). While tracing is off span() hands out one shared no-op object, so the
+# instrumentation left in the code costs a function call and nothing else.
+_events = None
+_thread_names = {}
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        # Attach results that are only known at the end (tokens used, cache hit, ...)
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        tid = _thread.get_ident()
+        if tid not in _thread_names:
+            import threading
+            _thread_names[tid] = threading.current_thread().name
+        event = {"name": self.name, "ph": "X", "ts": self.start / 1000, "dur": (end - self.start) / 1000,
+                 "pid": os.getpid(), "tid": tid}
+        if self.args:
+            event["args"] = self.args
+        events = _events
+        if events is not None:  # a background thread may still be finishing after the trace was written
+            events.append(event)  # list.append is atomic, spans may close on any thread
+        return False
+
+
+def span(name, **args):
+    if _events is None:
+        return _NO_SPAN
+    return _Span(name, args)
+
+def tracing_enabled():
+    return _events is not None
+
+def enable_tracing():
+    global _events
+    if _events is None:
+        _events = []
+
+def disable_tracing():
+    # Returns the events recorded so far
+    global _events
+    events, _events = _events or [], None
+    return events
+
+def write_chrome_trace(path, events):
+    import json
+    metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in _thread_names.items()]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+
+def summarize(events, limit=10):
+    # Total time per span name, slowest first
+    totals = {}
+    for event in events:
+        count, total = totals.get(event["name"], (0, 0.0))
+        totals[event["name"]] = (count + 1, total + event["dur"] / 1000)
+    return sorted(((name, count, total) for name, (count, total) in totals.items()), key=lambda item: -item[2])[:limit]
+
+def run_instrumented(fn, trace_file=None, profile_file=None):
+    # Runs fn() with tracing (--trace) and/or cProfile (--profile) switched on, writing both files at the end
+    # even when the run fails or is interrupted
+    profiler = None
+    if trace_file:
+        enable_tracing()
+    if profile_file:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with span("run", argv=sys.argv[1:]):
+            return fn()
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+            import pstats
+            print(f"\nProfile written to {profile_file}, top functions by cumulative time:")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+        if trace_file:
+            events = disable_tracing()
+            write_chrome_trace(trace_file, events)
+            print(f"\nTrace written to {trace_file} (open it in chrome://tracing or ui.perfetto.dev):")
+            for name, count, total in summarize(events):
+                print(f"  {name:<28} {count:5d}x {total:10.1f} ms")